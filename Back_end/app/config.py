@@ -1,7 +1,7 @@
 """Configuration management for the application."""
 
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator
 
@@ -45,16 +45,62 @@ class Settings(BaseSettings):
         le=600,
         description="Timeout for Ollama requests in seconds"
     )
+    ollama_max_parallel: int = Field(
+        default=1,
+        ge=1,
+        le=64,
+        description="Generations sent to Ollama at once (match the server's OLLAMA_NUM_PARALLEL); others wait"
+    )
+
+    # MCP tools server (shared pooled client, see app/services/mcp_client.py)
+    mcp_server_url: str = Field(default="http://localhost:8001", description="MCP server base URL")
+    mcp_timeout: float = Field(default=30.0, gt=0, le=300, description="Default MCP request timeout (seconds)")
+    mcp_tool_timeouts: Dict[str, float] = Field(
+        default={"campus": 30.0, "degrees": 45.0, "pedagogy": 20.0, "values": 20.0, "news": 30.0},
+        description="Per-tool MCP timeouts in seconds (JSON in env)"
+    )
+    mcp_max_connections: int = Field(default=20, ge=1, le=200)
+    mcp_max_keepalive_connections: int = Field(default=10, ge=0, le=200)
+    mcp_keepalive_expiry: float = Field(default=30.0, ge=0)
 
-    # Scraper Configuration
-    scraper_path: str = Field(
-        default="../MCP_Server/epitech_scraper",
-        description="Path to the Scrapy scraper"
+    # Backend tool cache (per-tool TTL in seconds, 0 disables; revalidated against the MCP snapshot version)
+    tool_cache_ttls: Dict[str, float] = Field(
+        default={"campus": 300.0, "degrees": 600.0, "pedagogy": 600.0, "values": 600.0, "news": 300.0},
+        description="Per-tool cache TTLs in seconds (JSON in env)"
     )
+    tool_cache_default_ttl: float = Field(default=300.0, ge=0)
+
+    # MCP circuit breakers (per tool): open after N consecutive failures or answers slower than the SLO
+    breaker_failure_threshold: int = Field(default=3, ge=1, le=100)
+    breaker_latency_slo_ms: float = Field(default=8000.0, gt=0)
+    breaker_open_sec: float = Field(default=30.0, ge=1, le=3600)
+
+    # Rendered prompt fragments (campus/degrees blocks) kept in an LRU
+    prompt_fragment_cache_size: int = Field(default=128, ge=1, le=10000)
+
+    # News (MCP `news` tool): articles injected in the prompt
     max_news_items: int = Field(default=3, ge=1, le=10)
 
     # Geocoding Configuration
     geocoding_timeout: int = Field(default=10, ge=1, le=60)
+    # Query api-adresse and Nominatim concurrently (first acceptable answer wins) instead of one after the other
+    geocode_race: bool = Field(default=True)
+    # Nominatim usage policy: ~1 request/s for the whole process; callers wait at most this long for a slot
+    nominatim_rate_per_sec: float = Field(default=1.0, gt=0, le=50)
+    nominatim_burst: int = Field(default=1, ge=1, le=50)
+    nominatim_max_wait_sec: float = Field(default=2.0, ge=0, le=60)
+    # Geocoding cache: in-memory LRU in front of a SQLite table (normalized query -> result)
+    geocode_cache_path: str = Field(default="data/geocode_cache.sqlite3")
+    geocode_cache_size: int = Field(default=2048, ge=1, le=1_000_000)
+    geocode_cache_ttl_sec: float = Field(default=30 * 86400, ge=0)
+    geocode_negative_ttl_sec: float = Field(default=86400, ge=0)
+    # Offline postal-code table (empty = bundled app/data/fr_postal_codes.bin)
+    postal_gazetteer_path: str = Field(default="")
+    # Offline city table (empty = bundled app/data/cities.tsv.gz)
+    city_gazetteer_path: str = Field(default="")
+    # POST /campus/nearest/batch: max queries per request, geocoding lookups in flight
+    campus_batch_max_queries: int = Field(default=50_000, ge=1, le=1_000_000)
+    geocode_batch_concurrency: int = Field(default=8, ge=1, le=100)
 
     # Language Detection
     min_words_for_lang_detection: int = Field(default=8, ge=1)
@@ -1,11 +1,23 @@
 """Main FastAPI application entry point."""
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.routes import chat_router
+from app.routes import campus_router, chat_router
+from app.services.circuit_breaker import breakers
+from app.services.geocode_cache import get_geocode_cache
+from app.services.geocoding_service import geocoder_stats
+from app.services.nominatim_queue import close_nominatim_queue, get_nominatim_queue
+from app.services.ollama_client import close_ollama_client, get_ollama_client, init_ollama_client
+from app.services.mcp_client import close_mcp_client, init_mcp_client
+from app.services.tool_cache import get_tool_cache
+from app.utils.city_gazetteer import get_city_gazetteer
+from app.utils.postal_gazetteer import get_postal_gazetteer
 
 # Configure logging
 logging.basicConfig(
@@ -14,11 +26,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients on startup and close them on shutdown."""
+    app.state.mcp_client = init_mcp_client(settings)
+    logger.info("MCP client ready (%s)", settings.mcp_server_url)
+    init_ollama_client(settings)
+    logger.info("Ollama client ready (%s, %d parallel)", settings.ollama_url, settings.ollama_max_parallel)
+    purged = await asyncio.to_thread(get_geocode_cache(settings).purge_expired)
+    if purged:
+        logger.info("Geocode cache: %d expired entries purged", purged)
+    # City index is parsed once (~0.5 s); do it now rather than on the first chat message
+    await asyncio.to_thread(get_city_gazetteer(settings.city_gazetteer_path or None).load)
+    get_postal_gazetteer(settings.postal_gazetteer_path or None).load()
+    try:
+        yield
+    finally:
+        await close_mcp_client()
+        await close_nominatim_queue()
+        await close_ollama_client()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
-    description="EpiQuoi Backend - AI Chat Assistant for Epitech"
+    description="EpiQuoi Backend - AI Chat Assistant for Epitech",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -32,6 +67,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(chat_router)
+app.include_router(campus_router)
 
 
 @app.get("/")
@@ -46,8 +82,20 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint (with MCP pool, circuit breaker, tool and geocode cache state)."""
+    mcp_client = getattr(app.state, "mcp_client", None)
+    return {
+        "status": "healthy",
+        "mcp": mcp_client.stats() if mcp_client is not None else None,
+        "mcp_breakers": breakers.snapshot(),
+        "ollama": get_ollama_client().snapshot(),
+        "tool_cache": get_tool_cache().snapshot(),
+        "geocode_cache": get_geocode_cache().snapshot(),
+        "geocoders": geocoder_stats.snapshot(),
+        "nominatim_queue": get_nominatim_queue().snapshot(),
+        "postal_gazetteer": get_postal_gazetteer(settings.postal_gazetteer_path or None).snapshot(),
+        "city_gazetteer": get_city_gazetteer(settings.city_gazetteer_path or None).snapshot(),
+    }
 
 
 if __name__ == "__main__":
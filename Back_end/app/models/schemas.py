@@ -40,3 +40,45 @@ class ChatResponse(BaseModel):
                 "backend_source": "Ollama Local (llama3.1)"
             }
         }
+
+
+class CampusBatchRequest(BaseModel):
+    """Request model for batch nearest-campus lookups."""
+
+    queries: List[str] = Field(..., min_length=1, description="Locations (postal codes, cities, addresses)")
+    k: int = Field(default=1, ge=1, le=20, description="Number of campuses returned per query (overall and in country)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": ["75011", "Toulouse", "Köln"],
+                "k": 2
+            }
+        }
+
+
+class CampusMatch(BaseModel):
+    """A campus and its distance to the queried location."""
+
+    city: str
+    country: str
+    dist_km: float
+
+
+class CampusBatchItem(BaseModel):
+    """Nearest campuses for one query of the batch."""
+
+    query: str
+    found: bool = Field(..., description="Whether the location could be geocoded")
+    label: Optional[str] = None
+    country: Optional[str] = None
+    nearest: List[CampusMatch] = Field(default_factory=list, description="k nearest campuses overall")
+    nearest_in_country: List[CampusMatch] = Field(
+        default_factory=list, description="k nearest campuses in the location's country"
+    )
+
+
+class CampusBatchResponse(BaseModel):
+    """Response model for batch nearest-campus lookups."""
+
+    results: List[CampusBatchItem]
@@ -1,5 +1,6 @@
 """Routes package."""
 
+from app.routes.campus import router as campus_router
 from app.routes.chat import router as chat_router
 
-__all__ = ["chat_router"]
+__all__ = ["campus_router", "chat_router"]
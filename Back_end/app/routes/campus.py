@@ -0,0 +1,39 @@
+"""Campus lookup routes."""
+
+import logging
+from fastapi import APIRouter, HTTPException
+
+from app.config import settings
+from app.models.schemas import CampusBatchRequest, CampusBatchResponse
+from app.services.geocoding_service import GeocodingService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/campus", tags=["campus"])
+
+
+@router.post("/nearest/batch", response_model=CampusBatchResponse)
+async def nearest_campus_batch(request: CampusBatchRequest) -> CampusBatchResponse:
+    """
+    Nearest Epitech campuses for a list of locations (e.g. prospect postal codes of a CRM export).
+
+    Args:
+        request: Location queries and number of campuses per query
+
+    Returns:
+        One result per query, in input order
+
+    Raises:
+        HTTPException: If the batch is too large or processing fails
+    """
+    if len(request.queries) > settings.campus_batch_max_queries:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many queries ({len(request.queries)} > {settings.campus_batch_max_queries})"
+        )
+    try:
+        results = await GeocodingService.nearest_campuses_batch(request.queries, k=request.k)
+        return CampusBatchResponse(results=results)
+    except Exception as e:
+        logger.error(f"Unexpected error in campus batch endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1,7 +1,11 @@
 """Chat endpoint routes."""
 
+import json
 import logging
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.models.schemas import ChatRequest, ChatResponse
 from app.services.chat_service import ChatService
@@ -38,3 +42,37 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
     except Exception as e:
         logger.error(f"Unexpected error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream_endpoint(request: ChatRequest) -> StreamingResponse:
+    """
+    Process a chat message and stream the AI response as Server-Sent Events.
+
+    Events:
+        meta:  {backend_source, tools, prepare_ms} once tools ran and the prompt is built
+        delta: {text} response text (complete lines)
+        done:  {prepare_ms, first_token_ms, total_ms, chars, ...}
+        error: {detail, status_code} if processing fails after the stream started
+    """
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in chat_service.stream_chat(request):
+                yield _sse(event, data)
+        except ChatServiceError as e:
+            logger.error(f"Chat service error (stream): {e.detail}")
+            yield _sse("error", {"detail": e.detail, "status_code": e.status_code})
+        except Exception as e:
+            logger.error(f"Unexpected error in chat stream endpoint: {e}")
+            yield _sse("error", {"detail": f"Internal server error: {str(e)}", "status_code": 500})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # No proxy buffering / caching: events must reach the browser as they are produced
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
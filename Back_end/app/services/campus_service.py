@@ -4,35 +4,40 @@ import httpx
 import logging
 from typing import Dict, Any, Optional
 
+from app.services.mcp_client import get_mcp_client
+from app.services.tool_cache import get_tool_cache
+
 logger = logging.getLogger(__name__)
 
 class CampusService:
     """Service for interacting with the Campus Scraper via MCP Server."""
     
-    MCP_SERVER_URL = "http://localhost:8001"
-
     async def get_campus_info(self) -> Optional[Dict[str, Any]]:
+        """Return the campus payload, served from the backend tool cache when still valid."""
+        return await get_tool_cache().get("campus", self._fetch_campus)
+
+    async def _fetch_campus(self) -> Optional[Dict[str, Any]]:
         """
         Trigger the campus spider on the MCP Server and retrieve data.
         
         Returns:
             Dict containing scraped campus data or None if failed.
         """
-        url = f"{self.MCP_SERVER_URL}/scrape/campus"
+        mcp = get_mcp_client()
+        url = mcp.tool_url("campus")
         logger.info(f"Calling MCP Server at {url} for campus data...")
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url)
-                
-                if response.status_code != 200:
-                    logger.error(f"MCP Server returned error: {response.status_code} - {response.text}")
-                    return None
-                
-                data = response.json()
-                print(f"📦 [Backend] Received from MCP: {data}")
-                logger.info("Successfully retrieved campus data from MCP Server.")
-                return data
+            response = await mcp.post_tool("campus")
+
+            if response.status_code != 200:
+                logger.error(f"MCP Server returned error: {response.status_code} - {response.text}")
+                return None
+
+            data = response.json()
+            print(f"📦 [Backend] Received from MCP: {data}")
+            logger.info("Successfully retrieved campus data from MCP Server.")
+            return data
 
         except httpx.RequestError as e:
             logger.error(f"Failed to connect to MCP Server: {e}")
@@ -1,20 +1,15 @@
 """Service for chat interactions with Ollama."""
 
+import asyncio
 import logging
 import re
-from typing import List, Dict, Optional, Tuple, Any
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List, Dict, Optional, Tuple, Any, Union
 
-import ollama
-import os
+import httpx
 
 from app.config import settings
-
-# Configure Ollama client URL if specified
-# Ollama uses OLLAMA_HOST environment variable (format: host:port)
-if settings.ollama_url:
-    # Extract host:port from URL (e.g., http://localhost:11434 -> localhost:11434)
-    url_parts = settings.ollama_url.replace("http://", "").replace("https://", "")
-    os.environ["OLLAMA_HOST"] = url_parts
 from app.exceptions import OllamaError
 from app.models.schemas import ChatRequest, MessageHistory
 from app.services.news_service import NewsService
@@ -23,14 +18,99 @@ from app.services.degrees_service import DegreesService
 from app.services.pedagogy_service import PedagogyService
 from app.services.values_service import ValuesService
 from app.services.geocoding_service import GeocodingService
+from app.services.ollama_client import OllamaResponseError, get_ollama_client
+from app.services.tool_cache import get_tool_cache, snapshot_version
 from app.utils.campus_data import CAMPUSES, CITY_ALIASES, format_campus_list
 from app.utils.language_detection import detect_language
 from app.utils.tool_router import ToolRouter
 from app.utils.tool_router import ToolDecision
 from app.utils.epitech_faq import methodology_fr, methodology_en
+from app.utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+CONTACT_PAGE_NOTICE = "Pour des coordonnées à jour, consulte : https://www.epitech.eu/contact/"
+
+
+@dataclass
+class PreparedChat:
+    """Everything needed to call the LLM for one turn (tools already run, prompt built)."""
+
+    messages: List[Dict[str, str]]
+    backend_source: str
+    tools: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+
+
+class ContactStreamFilter:
+    """
+    Incremental form of `ChatService._sanitize_contact_like_output` for streamed answers.
+
+    Text is released word by word. Held back: the current word (an email has no spaces)
+    and a trailing run of digits/separators that could still grow into a phone number.
+    Once the current line looks like contact details, the rest of that line is dropped;
+    contact details themselves are never sent.
+    """
+
+    # Trailing run that may be the start of a phone number ("01 23", "+33 (0)")
+    _NUMBER_TAIL_RE = re.compile(r"[+(\d][\d\s().-]*$")
+
+    def __init__(self, is_contact_like: Callable[[str], bool]):
+        self._is_contact_like = is_contact_like
+        self._pending = ""
+        self._line_sent = ""  # part of the current line already released
+        self._dropping = False
+        self.removed_any = False
+
+    def feed(self, text: str) -> str:
+        """Add model output; returns the text that can be sent now (possibly empty)."""
+        self._pending += text
+        out = []
+        while "\n" in self._pending:
+            rest, self._pending = self._pending.split("\n", 1)
+            out.append(self._end_line(rest))
+        out.append(self._release_words())
+        return "".join(out)
+
+    def flush(self) -> str:
+        """End of the answer: the last (unterminated) line, unless it is contact-like."""
+        rest, self._pending = self._pending, ""
+        if self._dropping or (rest and self._is_contact_like(self._line_sent + rest)):
+            self.removed_any = True
+            return ""
+        return rest
+
+    def _end_line(self, rest: str) -> str:
+        line_sent, dropping = self._line_sent, self._dropping
+        self._line_sent, self._dropping = "", False
+        if dropping or self._is_contact_like(line_sent + rest):
+            self.removed_any = True
+            # a fully dropped line leaves no trace, like in the non-streamed sanitizer
+            return "\n" if line_sent else ""
+        return rest + "\n"
+
+    def _release_words(self) -> str:
+        if self._dropping:
+            self._pending = ""
+            return ""
+        cut = max(self._pending.rfind(" "), self._pending.rfind("\t"))
+        if cut < 0:
+            return ""
+        ready, rest = self._pending[: cut + 1], self._pending[cut + 1 :]
+        number = self._NUMBER_TAIL_RE.search(ready)
+        if number is not None:
+            ready, rest = ready[: number.start()], ready[number.start() :] + rest
+        if not ready:
+            return ""
+        if self._is_contact_like(self._line_sent + ready):
+            self._dropping = True
+            self.removed_any = True
+            self._pending = ""
+            return ""
+        self._line_sent += ready
+        self._pending = rest
+        return ready
+
 
 class ChatService:
     """Service for handling chat interactions."""
@@ -43,6 +123,8 @@ class ChatService:
         self.pedagogy_service = PedagogyService()
         self.values_service = ValuesService()
         self.geocoding_service = GeocodingService()
+        # Rendered campus/degrees context blocks, keyed by MCP snapshot version + filters
+        self._prompt_fragments: LRUCache[tuple, Any] = LRUCache(settings.prompt_fragment_cache_size)
 
     # Keywords for intent detection
     NEWS_KEYWORDS = ["news", "actualité", "actu", "nouveauté", "événement"]
@@ -99,6 +181,159 @@ class ChatService:
         Raises:
             OllamaError: If Ollama API fails
         """
+        prepared = await self._prepare_chat(request)
+        if isinstance(prepared, dict):
+            return prepared
+
+        # Call Ollama with timeout and resource limits
+        print(f"\n🤖 APPEL À OLLAMA...")
+        print(f"   Modèle: {settings.ollama_model}")
+        print(f"   Timeout: {settings.ollama_timeout}s")
+        try:
+            start_time = time.time()
+
+            # Native async call: on timeout the request is cancelled and Ollama stops generating
+            response = await asyncio.wait_for(
+                get_ollama_client().chat(prepared.messages, self._ollama_options()),
+                timeout=settings.ollama_timeout
+            )
+            elapsed_time = time.time() - start_time
+            response_length = len(response['message']['content'])
+            print(f"   ✓ Réponse reçue en {elapsed_time:.2f}s ({response_length} caractères)")
+        except asyncio.TimeoutError:
+            raise self._ollama_timeout_error()
+        except Exception as ollama_error:
+            raise self._ollama_error(ollama_error)
+
+        print("=" * 60)
+        print("✅ REQUÊTE TRAITÉE AVEC SUCCÈS")
+        print(f"   Source: {prepared.backend_source}")
+        print("=" * 60 + "\n")
+
+        # Final safety: do not leak hallucinated coordinates (email/phone/address).
+        raw_text = response["message"]["content"]
+        cleaned_text = self._sanitize_contact_like_output(raw_text)
+
+        return {
+            "response": cleaned_text,
+            "backend_source": prepared.backend_source
+        }
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Process a chat request and stream the AI response as (event, data) pairs:
+
+        - ("meta", {backend_source, tools, prepare_ms}): once tools ran and the prompt is built
+        - ("delta", {text}): response text, released word by word
+        - ("done", {prepare_ms, first_token_ms, total_ms, chars, ...}): end of the answer
+
+        Text goes through `ContactStreamFilter`: a word is sent once complete, and only a
+        fragment that could still become contact details (a number, the current word) is
+        held back, so a phone number or email is never sent then retracted.
+
+        Raises:
+            OllamaError: If Ollama API fails (before or during the stream)
+        """
+        prepared = await self._prepare_chat(request)
+        if isinstance(prepared, dict):
+            # Canned answers (small-talk, FAQ, direct tool output): one delta
+            yield "meta", {"backend_source": prepared["backend_source"], "tools": [], "prepare_ms": None}
+            yield "delta", {"text": prepared["response"]}
+            yield "done", {"chars": len(prepared["response"])}
+            return
+
+        prepare_ms = int((time.time() - prepared.started_at) * 1000)
+        yield "meta", {"backend_source": prepared.backend_source, "tools": prepared.tools, "prepare_ms": prepare_ms}
+
+        print("\n🤖 APPEL À OLLAMA (stream)...")
+        print(f"   Modèle: {settings.ollama_model}")
+        start_time = time.time()
+        deadline = start_time + settings.ollama_timeout
+        first_token_ms: Optional[int] = None
+        final: Dict[str, Any] = {}
+        contact_filter = ContactStreamFilter(self._is_contact_like_line)
+        sent: List[str] = []
+        chunks = get_ollama_client().chat_stream(prepared.messages, self._ollama_options())
+        try:
+            while True:
+                try:
+                    part = await asyncio.wait_for(chunks.__anext__(), timeout=max(0.0, deadline - time.time()))
+                except StopAsyncIteration:
+                    break
+                if first_token_ms is None:
+                    first_token_ms = int((time.time() - start_time) * 1000)
+                if part.get("done"):
+                    final = {k: part.get(k) for k in ("eval_count", "prompt_eval_count")}
+                text = contact_filter.feed(part["message"]["content"])
+                if text:
+                    sent.append(text)
+                    yield "delta", {"text": text}
+        except asyncio.TimeoutError:
+            raise self._ollama_timeout_error()
+        except Exception as ollama_error:
+            raise self._ollama_error(ollama_error)
+        finally:
+            # Closes the HTTP stream (and frees the generation slot) if we stop early
+            await chunks.aclose()
+
+        tail = contact_filter.flush()
+        if contact_filter.removed_any and "epitech.eu/contact" not in "".join(sent) + tail:
+            tail = (tail + "\n\n" if tail.strip() else "\n") + CONTACT_PAGE_NOTICE
+        if tail:
+            sent.append(tail)
+            yield "delta", {"text": tail}
+
+        total_ms = int((time.time() - prepared.started_at) * 1000)
+        chars = sum(len(t) for t in sent)
+        print(f"   ✓ Réponse streamée en {time.time() - start_time:.2f}s ({chars} caractères)")
+        print(f"   Source: {prepared.backend_source}")
+        yield "done", {
+            "prepare_ms": prepare_ms,
+            "first_token_ms": first_token_ms,
+            "total_ms": total_ms,
+            "chars": chars,
+            **final,
+        }
+
+    @staticmethod
+    def _ollama_options() -> Dict[str, Any]:
+        return {
+            "temperature": settings.ollama_temperature,
+            "num_ctx": 2048,  # Limite le contexte pour économiser la mémoire
+            "num_predict": 512,  # Limite la longueur de la réponse
+        }
+
+    @staticmethod
+    def _ollama_timeout_error() -> OllamaError:
+        logger.error(f"Ollama request timeout after {settings.ollama_timeout}s")
+        return OllamaError(
+            f"La requête a pris trop de temps (>{settings.ollama_timeout}s). "
+            "Essayez un modèle plus léger (llama3.2:1b) ou réduisez la longueur du message."
+        )
+
+    @staticmethod
+    def _ollama_error(ollama_error: Exception) -> OllamaError:
+        if isinstance(ollama_error, OllamaError):
+            return ollama_error
+        error_msg = str(ollama_error)
+        logger.error(f"Ollama connection error: {error_msg}")
+
+        if isinstance(ollama_error, OllamaResponseError):
+            return OllamaError(f"Erreur Ollama : {error_msg}")
+        # Check if it's a connection error
+        if isinstance(ollama_error, httpx.ConnectError) or "connect" in error_msg.lower():
+            return OllamaError(
+                "Ollama n'est pas en cours d'exécution. "
+                "Veuillez démarrer Ollama avec la commande : ollama serve"
+            )
+        return OllamaError(f"Erreur Ollama : {error_msg}")
+
+    async def _prepare_chat(self, request: ChatRequest) -> Union[Dict[str, str], PreparedChat]:
+        """
+        Everything before the LLM call: guardrails, tools, prompt.
+        Returns a final {response, backend_source} dict when no LLM call is needed.
+        """
+        started_at = time.time()
         print("=" * 60)
         print(f"📨 NOUVELLE REQUÊTE REÇUE")
         print(f"   Message: {request.message[:100]}{'...' if len(request.message) > 100 else ''}")
@@ -372,18 +607,12 @@ class ChatService:
                 # If campus list is requested, return a safe deterministic answer from the campus tool.
                 if "campus" in msg_lower or "campuses" in msg_lower:
                     campus_data = await self.campus_service.get_campus_info()
-                    optimized = self._optimize_campus_data(campus_data)
-                    country_filter = _extract_country_filter(msg_lower)
-                    if country_filter:
-                        optimized = [c for c in optimized if (c.get("pays") or "").lower() == country_filter.lower()]
-                    region_filter = _extract_region_filter(msg_lower)
-                    if region_filter:
-                        allowed = {c.lower() for c in region_filter}
-                        optimized = [c for c in optimized if (c.get("ville") or "").lower() in allowed]
-                    campus_text = self._format_campus_to_text(optimized)
+                    campus_text, campus_count = self._campus_fragment(
+                        campus_data, _extract_country_filter(msg_lower), _extract_region_filter(msg_lower)
+                    )
                     return {
                         "response": (
-                            f"Voici les campus Epitech ({len(optimized)}) :\n{campus_text}\n\n"
+                            f"Voici les campus Epitech ({campus_count}) :\n{campus_text}\n\n"
                             "Je ne peux pas répondre à la recette/au sujet non lié à Epitech ici. Pose-moi une question Epitech (campus, formations, admissions, pédagogie)."
                         ),
                         "backend_source": "Scraper Campus (filtered)",
@@ -640,17 +869,28 @@ class ChatService:
             )
 
             # Run selected tools in parallel (faster when multiple tools are needed).
-            import asyncio
-
             tool_tasks: Dict[str, asyncio.Task] = {}
-            if tool_decisions["news"].call:
-                tool_tasks["news"] = asyncio.create_task(self.news_service.get_epitech_news())
-            if tool_decisions["campus"].call:
-                tool_tasks["campus"] = asyncio.create_task(self.campus_service.get_campus_info())
-            if tool_decisions["degrees"].call:
-                tool_tasks["degrees"] = asyncio.create_task(self.degrees_service.get_degrees_info())
-            if tool_decisions.get("pedagogy") and tool_decisions["pedagogy"].call:
-                tool_tasks["pedagogy"] = asyncio.create_task(self.pedagogy_service.get_pedagogy_info())
+            tools_started = time.time()
+            mcp_calls = {
+                "news": self.news_service.get_news_payload,
+                "campus": self.campus_service.get_campus_info,
+                "degrees": self.degrees_service.get_degrees_info,
+                "pedagogy": self.pedagogy_service.get_pedagogy_info,
+            }
+            mcp_selected = [name for name in mcp_calls if tool_decisions.get(name) and tool_decisions[name].call]
+            if len(mcp_selected) >= 2:
+                # Several MCP tools: one batched round trip (tools still fresh in the cache are not requested).
+                print(f"   ⚡ Appel MCP groupé : {', '.join(mcp_selected)}")
+                mcp_batch = asyncio.create_task(get_tool_cache().get_many(mcp_selected))
+
+                async def _from_batch(name: str) -> Optional[Dict[str, Any]]:
+                    return (await mcp_batch).get(name)
+
+                for name in mcp_selected:
+                    tool_tasks[name] = asyncio.create_task(_from_batch(name))
+            else:
+                for name in mcp_selected:
+                    tool_tasks[name] = asyncio.create_task(mcp_calls[name]())
 
             # Tool 1: News Scraper
             print("🔍 [2/6] Vérification si scraper NEWS nécessaire...")
@@ -659,7 +899,7 @@ class ChatService:
                 if tool_decisions["news"].reasons:
                     print(f"   ↳ raisons: {', '.join(tool_decisions['news'].reasons[:6])}")
                 logger.info("Tool Activation: Scraper Epitech News")
-                news_info = await tool_tasks["news"]
+                news_info = self.news_service.format_news(await tool_tasks["news"], time.time() - tools_started)
                 print("   ✓ Scraping news terminé avec succès")
                 context_extra += (
                     f"\n\n[SYSTÈME: DONNÉES LIVE INJECTÉES]\n"
@@ -693,33 +933,11 @@ class ChatService:
                             "(attendu: dict{data} ou list)"
                         )
                     
-                    # Optimize data to prevent context overflow (OOM)
-                    optimized_data = self._optimize_campus_data(campus_data)
-
-                    # Apply country filter if the user asked "campus en <pays>"
                     country_filter = _extract_country_filter(msg_lower)
-                    if country_filter:
-                        before = len(optimized_data)
-                        optimized_data = [
-                            c for c in optimized_data if (c.get("pays") or "").lower() == country_filter.lower()
-                        ]
-                        print(f"   ✓ Filtre pays '{country_filter}' : {before} -> {len(optimized_data)} campus")
-
-                    # Apply region filter if the user asked "campus en région <...>"
                     region_filter = _extract_region_filter(msg_lower)
-                    if region_filter:
-                        before = len(optimized_data)
-                        allowed = {c.lower() for c in region_filter}
-                        optimized_data = [c for c in optimized_data if (c.get("ville") or "").lower() in allowed]
-                        print(f"   ✓ Filtre région '{' / '.join(region_filter)}' : {before} -> {len(optimized_data)} campus")
-
-                    print(f"   ✓ Données optimisées : {len(optimized_data)} campus conservés après filtrage")
-                    
-                    # Convert to text to save tokens (JSON is too heavy)
-                    campus_text = self._format_campus_to_text(optimized_data)
+                    campus_text, total_campus = self._campus_fragment(campus_data, country_filter, region_filter)
                     print(f"   ✓ Texte généré pour le prompt (DEBUG) :\n{campus_text}")
-                    
-                    total_campus = len(optimized_data)
+
                     context_extra += (
                         f"\n\n[SYSTÈME: DONNÉES CAMPUS LIVE - {total_campus} CAMPUS]\n"
                         f"⚠️ IMPORTANT : Il y a EXACTEMENT {total_campus} campus dans cette liste. "
@@ -750,87 +968,9 @@ class ChatService:
                     print(f"   ✓ Scraping degrees terminé : {len(items)} programmes")
 
                     # Build a compact, source-first block (LLM must cite URLs).
-                    sources: list[str] = []
-                    blocks: list[str] = []
                     domain_terms = ("santé", "sante", "biotech", "biotechnologie", "médical", "medical", "hôpital", "hopital")
                     domain_query = [t for t in domain_terms if t in msg_lower]
-                    for prog in items:
-                        if not isinstance(prog, dict):
-                            continue
-                        nom = prog.get("nom")
-                        niveau = prog.get("niveau")
-                        cat = prog.get("categorie")
-                        pages = prog.get("pages", []) if isinstance(prog.get("pages"), list) else []
-
-                        header_parts = [p for p in [nom, cat, niveau] if p]
-                        header = " - ".join(header_parts) if header_parts else "Programme"
-
-                        # Keep only a few page snippets in the prompt (avoid token explosion),
-                        # but keep ALL URLs in Sources.
-                        page_lines: list[str] = []
-                        for p in pages:
-                            if not isinstance(p, dict):
-                                continue
-                            url = p.get("url")
-                            if isinstance(url, str):
-                                sources.append(url)
-                            title = p.get("h1") or p.get("title")
-                            desc = p.get("description")
-                            snippet = p.get("snippet")
-                            duration_hints = p.get("duration_hints") if isinstance(p.get("duration_hints"), list) else []
-
-                            # If the user asked a domain question (e.g., santé),
-                            # only keep pages that actually mention the domain in title/description/snippet.
-                            if domain_query:
-                                hay = " ".join([str(x or "") for x in (title, desc, snippet)]).lower()
-                                if not any(t in hay for t in domain_query):
-                                    continue
-
-                            line = f"- {title}" if title else "- Page"
-                            if snippet and isinstance(snippet, str):
-                                line += f": {snippet[:220]}{'…' if len(snippet) > 220 else ''}"
-                            if duration_hints:
-                                # Show at most 2 duration hints to keep it compact.
-                                dh = ", ".join([str(x) for x in duration_hints[:2]])
-                                line += f" (Durée repérée: {dh})"
-                            if url:
-                                line += f" (Source: {url})"
-                            # Show max 2 lines per programme to keep prompt small
-                            page_lines.append(line)
-                            if len(page_lines) >= 2:
-                                break
-
-                        if page_lines:
-                            blocks.append(header + "\n" + "\n".join(page_lines))
-
-                    # Deduplicate sources while preserving order
-                    seen = set()
-                    uniq_sources: list[str] = []
-                    for u in sources:
-                        if u in seen:
-                            continue
-                        seen.add(u)
-                        uniq_sources.append(u)
-
-                    degrees_text = "\n\n".join(blocks) if blocks else "Aucune donnée exploitable."
-                    context_extra += (
-                        "\n\n[SYSTÈME: DONNÉES DIPLÔMES/PROGRAMMES LIVE]\n"
-                        "Voici les informations OFFICIELLES scrapées (avec sources) :\n"
-                        f"{degrees_text}\n\n"
-                        "SOURCES (à afficher dans la réponse) :\n"
-                        + "\n".join(f"- {u}" for u in uniq_sources[:25])
-                        + ("\n- ... (autres sources disponibles)" if len(uniq_sources) > 25 else "")
-                        + "\n\n"
-                        "RÈGLES STRICTES :\n"
-                        "- Commence ta réponse par **1 phrase de reformulation** (ex: \"Si je reformule, tu veux la liste des spécialisations Epitech...\").\n"
-                        "- N'INVENTE PAS de spécialités/secteurs (ex: santé, énergie, biotech...) si ce n'est pas dans la liste ci-dessus.\n"
-                        "- N'INVENTE PAS de durées (1 an / 2 ans / etc.) : ne donne une durée que si elle apparaît dans les lignes \"Durée repérée\" ci-dessus, et cite la page correspondante.\n"
-                        "- Si l'utilisateur demande le **MBA**, et que des pages MBA sont dans les SOURCES, tu DOIS confirmer que le MBA existe et répondre UNIQUEMENT avec ces pages (ne le nie jamais).\n"
-                        "- Si l'utilisateur demande un domaine précis (ex: santé), et qu'aucune page ne correspond dans les sources, dis clairement que tu n'as pas d'information officielle sur une spécialisation santé, et propose les alternatives (IA/Data/Cyber) sans inventer de diplôme.\n"
-                        "- Si l'utilisateur demande le détail des spécialisations, dis que tu peux expliquer les grandes familles (PGE/MSc/Coding Academy) mais que tu n'as pas le catalogue complet.\n"
-                        "- Quand tu donnes un détail (programme/specialisation), ajoute la/les URL(s) correspondantes en 'Sources:' à la fin.\n"
-                        "Utilise ces données comme source prioritaire si l'utilisateur demande les diplômes, programmes ou cursus."
-                    )
+                    context_extra += self._degrees_fragment(degrees_data, domain_query)
                     if needs_track_clarification:
                         context_extra += (
                             "\n\n[INSTRUCTION]\n"
@@ -880,68 +1020,8 @@ class ChatService:
             )
             print(f"   ✓ {len(messages)} messages préparés")
 
-            # Call Ollama with timeout and resource limits
-            print(f"\n🤖 APPEL À OLLAMA...")
-            print(f"   Modèle: {settings.ollama_model}")
-            print(f"   Timeout: {settings.ollama_timeout}s")
-            try:
-                import asyncio
-                import time
-                start_time = time.time()
-                
-                # Wrap synchronous ollama.chat in a thread to prevent blocking
-                def call_ollama():
-                    return ollama.chat(
-                        model=settings.ollama_model,
-                        messages=messages,
-                        options={
-                            "temperature": settings.ollama_temperature,
-                            "num_ctx": 2048,  # Limite le contexte pour économiser la mémoire
-                            "num_predict": 512,  # Limite la longueur de la réponse
-                        }
-                    )
-                
-                # Use async with timeout to prevent system freeze
-                loop = asyncio.get_event_loop()
-                response = await asyncio.wait_for(
-                    loop.run_in_executor(None, call_ollama),
-                    timeout=settings.ollama_timeout
-                )
-                elapsed_time = time.time() - start_time
-                response_length = len(response['message']['content'])
-                print(f"   ✓ Réponse reçue en {elapsed_time:.2f}s ({response_length} caractères)")
-            except asyncio.TimeoutError:
-                logger.error(f"Ollama request timeout after {settings.ollama_timeout}s")
-                raise OllamaError(
-                    f"La requête a pris trop de temps (>{settings.ollama_timeout}s). "
-                    "Essayez un modèle plus léger (llama3.2:1b) ou réduisez la longueur du message."
-                )
-            except Exception as ollama_error:
-                error_msg = str(ollama_error)
-                logger.error(f"Ollama connection error: {error_msg}")
-                
-                # Check if it's a connection error
-                if "connection" in error_msg.lower() or "connect" in error_msg.lower():
-                    raise OllamaError(
-                        "Ollama n'est pas en cours d'exécution. "
-                        "Veuillez démarrer Ollama avec la commande : ollama serve"
-                    )
-                else:
-                    raise OllamaError(f"Erreur Ollama : {error_msg}")
-
-            print("=" * 60)
-            print("✅ REQUÊTE TRAITÉE AVEC SUCCÈS")
-            print(f"   Source: {backend_source}")
-            print("=" * 60 + "\n")
-
-            # Final safety: do not leak hallucinated coordinates (email/phone/address).
-            raw_text = response["message"]["content"]
-            cleaned_text = self._sanitize_contact_like_output(raw_text)
-            
-            return {
-                "response": cleaned_text,
-                "backend_source": backend_source
-            }
+            tools = list(tool_tasks) + (["location"] if location_context else [])
+            return PreparedChat(messages=messages, backend_source=backend_source, tools=tools, started_at=started_at)
 
         except OllamaError:
             # Re-raise Ollama errors as-is
@@ -950,6 +1030,150 @@ class ChatService:
             logger.error(f"Unexpected error in chat service: {e}")
             raise OllamaError(f"Failed to process chat: {str(e)}")
 
+    def _degrees_fragment(self, degrees_data: Dict[str, Any], domain_query: List[str]) -> str:
+        """
+        Render the degrees context block for the prompt.
+        Memoized per (MCP snapshot version, domain query) in the prompt fragment LRU.
+        """
+        def build() -> str:
+            blocks, uniq_sources = self._build_degrees_blocks(degrees_data.get("data", []), domain_query)
+            degrees_text = "\n\n".join(blocks) if blocks else "Aucune donnée exploitable."
+            return (
+                "\n\n[SYSTÈME: DONNÉES DIPLÔMES/PROGRAMMES LIVE]\n"
+                "Voici les informations OFFICIELLES scrapées (avec sources) :\n"
+                f"{degrees_text}\n\n"
+                "SOURCES (à afficher dans la réponse) :\n"
+                + "\n".join(f"- {u}" for u in uniq_sources[:25])
+                + ("\n- ... (autres sources disponibles)" if len(uniq_sources) > 25 else "")
+                + "\n\n"
+                "RÈGLES STRICTES :\n"
+                "- Commence ta réponse par **1 phrase de reformulation** (ex: \"Si je reformule, tu veux la liste des spécialisations Epitech...\").\n"
+                "- N'INVENTE PAS de spécialités/secteurs (ex: santé, énergie, biotech...) si ce n'est pas dans la liste ci-dessus.\n"
+                "- N'INVENTE PAS de durées (1 an / 2 ans / etc.) : ne donne une durée que si elle apparaît dans les lignes \"Durée repérée\" ci-dessus, et cite la page correspondante.\n"
+                "- Si l'utilisateur demande le **MBA**, et que des pages MBA sont dans les SOURCES, tu DOIS confirmer que le MBA existe et répondre UNIQUEMENT avec ces pages (ne le nie jamais).\n"
+                "- Si l'utilisateur demande un domaine précis (ex: santé), et qu'aucune page ne correspond dans les sources, dis clairement que tu n'as pas d'information officielle sur une spécialisation santé, et propose les alternatives (IA/Data/Cyber) sans inventer de diplôme.\n"
+                "- Si l'utilisateur demande le détail des spécialisations, dis que tu peux expliquer les grandes familles (PGE/MSc/Coding Academy) mais que tu n'as pas le catalogue complet.\n"
+                "- Quand tu donnes un détail (programme/specialisation), ajoute la/les URL(s) correspondantes en 'Sources:' à la fin.\n"
+                "Utilise ces données comme source prioritaire si l'utilisateur demande les diplômes, programmes ou cursus."
+            )
+
+        version = snapshot_version(degrees_data)
+        if version is None:
+            return build()
+        return self._prompt_fragments.get_or_build(("degrees", version, tuple(domain_query)), build)
+
+    def _campus_fragment(
+        self, campus_data: Any, country_filter: Optional[str], region_filter: Optional[List[str]]
+    ) -> Tuple[str, int]:
+        """
+        Optimize, filter and render the campus list: returns (campus_text, campus_count).
+        Memoized per (MCP snapshot version, country filter, region filter) in the prompt fragment LRU.
+        """
+        def build() -> Tuple[str, int]:
+            # Optimize data to prevent context overflow (OOM)
+            optimized_data = self._optimized_campus(campus_data)
+
+            # Apply country filter if the user asked "campus en <pays>"
+            if country_filter:
+                before = len(optimized_data)
+                optimized_data = [
+                    c for c in optimized_data if (c.get("pays") or "").lower() == country_filter.lower()
+                ]
+                print(f"   ✓ Filtre pays '{country_filter}' : {before} -> {len(optimized_data)} campus")
+
+            # Apply region filter if the user asked "campus en région <...>"
+            if region_filter:
+                before = len(optimized_data)
+                allowed = {c.lower() for c in region_filter}
+                optimized_data = [c for c in optimized_data if (c.get("ville") or "").lower() in allowed]
+                print(f"   ✓ Filtre région '{' / '.join(region_filter)}' : {before} -> {len(optimized_data)} campus")
+
+            print(f"   ✓ Données optimisées : {len(optimized_data)} campus conservés après filtrage")
+            # Convert to text to save tokens (JSON is too heavy)
+            return self._format_campus_to_text(optimized_data), len(optimized_data)
+
+        version = snapshot_version(campus_data)
+        if version is None:
+            return build()
+        key = (
+            "campus",
+            version,
+            (country_filter or "").lower(),
+            tuple(sorted(c.lower() for c in region_filter or [])),
+        )
+        return self._prompt_fragments.get_or_build(key, build)
+
+    def _build_degrees_blocks(self, items: List[Any], domain_query: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Build the per-programme prompt blocks and the deduplicated source URLs from the degrees payload.
+        With a domain query (e.g. santé), only pages mentioning the domain are kept.
+        """
+        sources: list[str] = []
+        blocks: list[str] = []
+        for prog in items:
+            if not isinstance(prog, dict):
+                continue
+            nom = prog.get("nom")
+            niveau = prog.get("niveau")
+            cat = prog.get("categorie")
+            pages = prog.get("pages", []) if isinstance(prog.get("pages"), list) else []
+
+            header_parts = [p for p in [nom, cat, niveau] if p]
+            header = " - ".join(header_parts) if header_parts else "Programme"
+
+            # Keep only a few page snippets in the prompt (avoid token explosion),
+            # but keep ALL URLs in Sources.
+            page_lines: list[str] = []
+            for p in pages:
+                if not isinstance(p, dict):
+                    continue
+                url = p.get("url")
+                if isinstance(url, str):
+                    sources.append(url)
+                title = p.get("h1") or p.get("title")
+                desc = p.get("description")
+                snippet = p.get("snippet")
+                duration_hints = p.get("duration_hints") if isinstance(p.get("duration_hints"), list) else []
+
+                # If the user asked a domain question (e.g., santé),
+                # only keep pages that actually mention the domain in title/description/snippet.
+                if domain_query:
+                    hay = " ".join([str(x or "") for x in (title, desc, snippet)]).lower()
+                    if not any(t in hay for t in domain_query):
+                        continue
+
+                line = f"- {title}" if title else "- Page"
+                if snippet and isinstance(snippet, str):
+                    line += f": {snippet[:220]}{'…' if len(snippet) > 220 else ''}"
+                if duration_hints:
+                    # Show at most 2 duration hints to keep it compact.
+                    dh = ", ".join([str(x) for x in duration_hints[:2]])
+                    line += f" (Durée repérée: {dh})"
+                if url:
+                    line += f" (Source: {url})"
+                # Show max 2 lines per programme to keep prompt small
+                page_lines.append(line)
+                if len(page_lines) >= 2:
+                    break
+
+            if page_lines:
+                blocks.append(header + "\n" + "\n".join(page_lines))
+
+        # Deduplicate sources while preserving order
+        seen = set()
+        uniq_sources: list[str] = []
+        for u in sources:
+            if u in seen:
+                continue
+            seen.add(u)
+            uniq_sources.append(u)
+
+        return blocks, uniq_sources
+
+    def _optimized_campus(self, campus_data: Any) -> List[Dict]:
+        """`_optimize_campus_data`, memoized per MCP snapshot version by the tool cache."""
+        return get_tool_cache().derived("campus", "optimized", campus_data, self._optimize_campus_data)
+
     def _format_campus_to_text(self, data: List[Dict]) -> str:
         """Format optimized campus data into a compact text list."""
         lines = []
@@ -1341,26 +1565,10 @@ class ChatService:
         if not text or not isinstance(text, str):
             return text
 
-        email_re = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE)
-        phone_re = re.compile(r"(\+?\d[\d\s().-]{7,}\d)")
-
         removed_any = False
         kept_lines: list[str] = []
         for line in text.splitlines():
-            low = line.lower()
-            if (
-                "tél" in low
-                or "tel" in low
-                or "téléphone" in low
-                or "telephone" in low
-                or "courriel" in low
-                or "email" in low
-                or "e-mail" in low
-                or low.strip().startswith("adresse")
-                or low.strip().startswith("address")
-                or email_re.search(line)
-                or phone_re.search(line)
-            ):
+            if self._is_contact_like_line(line):
                 removed_any = True
                 continue
             kept_lines.append(line)
@@ -1368,5 +1576,26 @@ class ChatService:
         cleaned = "\n".join(kept_lines).strip()
         if removed_any:
             if "epitech.eu/contact" not in cleaned:
-                cleaned = (cleaned + "\n\n" if cleaned else "") + "Pour des coordonnées à jour, consulte : https://www.epitech.eu/contact/"
+                cleaned = (cleaned + "\n\n" if cleaned else "") + CONTACT_PAGE_NOTICE
         return cleaned
+
+    _EMAIL_RE = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE)
+    _PHONE_RE = re.compile(r"(\+?\d[\d\s().-]{7,}\d)")
+
+    @classmethod
+    def _is_contact_like_line(cls, line: str) -> bool:
+        """Whether a response line looks like contact details (email/phone/address)."""
+        low = line.lower()
+        return bool(
+            "tél" in low
+            or "tel" in low
+            or "téléphone" in low
+            or "telephone" in low
+            or "courriel" in low
+            or "email" in low
+            or "e-mail" in low
+            or low.strip().startswith("adresse")
+            or low.strip().startswith("address")
+            or cls._EMAIL_RE.search(line)
+            or cls._PHONE_RE.search(line)
+        )
@@ -0,0 +1,114 @@
+"""Per-tool circuit breakers for MCP calls."""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker.
+
+    - closed: calls go through; consecutive failures (errors, or answers slower
+      than the latency SLO) are counted and open the breaker at the threshold.
+    - open: calls are refused (callers serve their last known good payload)
+      until `open_sec` has elapsed.
+    - half_open: a single probe call is let through; success closes the
+      breaker, failure opens it again for another `open_sec`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, latency_slo_ms: float = 8000.0, open_sec: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.latency_slo_ms = latency_slo_ms
+        self.open_sec = open_sec
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (moves open -> half_open once the cool-down is over)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.opened_at is not None and time.time() - self.opened_at >= self.open_sec:
+            self.state = HALF_OPEN
+            logger.info("Circuit %s half-open: probing MCP", self.name)
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, latency_ms: float) -> None:
+        if latency_ms > self.latency_slo_ms:
+            self.record_failure(f"slow answer ({int(latency_ms)}ms > SLO {int(self.latency_slo_ms)}ms)")
+            return
+        if self.state != CLOSED:
+            logger.info("Circuit %s closed", self.name)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self, reason: str = "call failed") -> None:
+        self.last_error = reason
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning("Circuit %s open for %ss: %s", self.name, self.open_sec, reason)
+                print(f"🔌 [Backend] Circuit MCP '{self.name}' ouvert ({reason})")
+            self.state = OPEN
+            self.opened_at = time.time()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without an outcome (e.g. the call was cancelled)."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_for_sec": round(max(0.0, self.open_sec - (time.time() - self.opened_at)), 1)
+            if self.state == OPEN and self.opened_at is not None
+            else 0.0,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+
+class BreakerRegistry:
+    """One breaker per tool, created on first use with the shared settings."""
+
+    def __init__(self, config: Settings = settings):
+        self.config = config
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, tool: str) -> CircuitBreaker:
+        breaker = self._breakers.get(tool)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                tool,
+                failure_threshold=self.config.breaker_failure_threshold,
+                latency_slo_ms=self.config.breaker_latency_slo_ms,
+                open_sec=self.config.breaker_open_sec,
+            )
+            self._breakers[tool] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {tool: b.snapshot() for tool, b in self._breakers.items()}
+
+
+breakers = BreakerRegistry()
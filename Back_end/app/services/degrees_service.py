@@ -5,27 +5,32 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from app.services.mcp_client import get_mcp_client
+from app.services.tool_cache import get_tool_cache
+
 logger = logging.getLogger(__name__)
 
 
 class DegreesService:
     """Service for interacting with the Degrees tool exposed by MCP Server."""
 
-    MCP_SERVER_URL = "http://localhost:8001"
-
     async def get_degrees_info(self) -> Optional[Dict[str, Any]]:
+        """Return the degrees payload, served from the backend tool cache when still valid."""
+        return await get_tool_cache().get("degrees", self._fetch_degrees)
+
+    async def _fetch_degrees(self) -> Optional[Dict[str, Any]]:
         """
         Trigger the degrees scraper on the MCP Server and retrieve data.
 
         Returns:
             Dict containing scraped degrees data or None if failed.
         """
-        url = f"{self.MCP_SERVER_URL}/scrape/degrees"
+        mcp = get_mcp_client()
+        url = mcp.tool_url("degrees")
         logger.info("Calling MCP Server at %s for degrees data...", url)
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url)
+            response = await mcp.post_tool("degrees")
 
             if response.status_code != 200:
                 logger.error(
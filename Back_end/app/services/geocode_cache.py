@@ -0,0 +1,149 @@
+"""Two-tier cache for geocoding results: in-memory LRU in front of a SQLite table."""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import Settings, settings
+from app.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    query TEXT PRIMARY KEY,
+    lon REAL,
+    lat REAL,
+    label TEXT,
+    country TEXT,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class GeocodeResult:
+    """Where a location query resolved to; `coords` is None for a negative (not found) result."""
+
+    coords: Optional[Tuple[float, float]]  # (lon, lat)
+    label: str = "Localisation inconnue"
+    country: str = "Inconnu"
+
+    @property
+    def found(self) -> bool:
+        return self.coords is not None
+
+
+def normalize_query(query: str) -> str:
+    """Cache key: case-folded, whitespace collapsed, surrounding punctuation dropped ("  Lyon ?" -> "lyon")."""
+    q = unicodedata.normalize("NFKC", query or "").casefold()
+    return " ".join(q.split()).strip(" .,;:!?\"'")
+
+
+class GeocodeCache:
+    """
+    Memory tier: bounded LRU, entries carry their own expiry.
+    Disk tier: SQLite table shared by restarts (and by workers on the same host).
+    Found results live `ttl_sec`, negative ones `negative_ttl_sec` (a place that
+    does not geocode today might once the query is spelled differently upstream).
+    """
+
+    def __init__(self, path: str, maxsize: int = 2048, ttl_sec: float = 30 * 86400, negative_ttl_sec: float = 86400):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.negative_ttl_sec = negative_ttl_sec
+        self._memory: LRUCache[str, Tuple[float, GeocodeResult]] = LRUCache(maxsize)
+        self.stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0, "negative_stored": 0}
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Short-lived connections: calls come from worker threads (asyncio.to_thread).
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def _load(self, key: str) -> Optional[Tuple[float, GeocodeResult]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT lon, lat, label, country, expires_at FROM geocode_cache WHERE query = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        lon, lat, label, country, expires_at = row
+        coords = (lon, lat) if lon is not None and lat is not None else None
+        return expires_at, GeocodeResult(coords=coords, label=label, country=country)
+
+    def _save(self, key: str, expires_at: float, result: GeocodeResult) -> None:
+        lon, lat = result.coords if result.coords is not None else (None, None)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (query, lon, lat, label, country, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, lon, lat, result.label, result.country, expires_at),
+            )
+
+    async def get(self, query: str) -> Optional[GeocodeResult]:
+        """Cached result for `query` (found or negative), None on a miss."""
+        key = normalize_query(query)
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] > now:
+            self.stats["memory_hits"] += 1
+            return entry[1]
+        try:
+            entry = await asyncio.to_thread(self._load, key)
+        except sqlite3.Error as e:
+            logger.warning("Geocode cache read failed: %s", e)
+            entry = None
+        if entry is not None and entry[0] > now:
+            self.stats["disk_hits"] += 1
+            self._memory.put(key, entry)
+            return entry[1]
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, query: str, result: GeocodeResult) -> None:
+        key = normalize_query(query)
+        expires_at = time.time() + (self.ttl_sec if result.found else self.negative_ttl_sec)
+        self._memory.put(key, (expires_at, result))
+        self.stats["stored" if result.found else "negative_stored"] += 1
+        try:
+            await asyncio.to_thread(self._save, key, expires_at, result)
+        except sqlite3.Error as e:
+            logger.warning("Geocode cache write failed: %s", e)
+
+    def snapshot(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory": self._memory.stats(),
+        }
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the disk tier. Returns the number removed."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM geocode_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+_cache: Optional[GeocodeCache] = None
+
+
+def get_geocode_cache(config: Settings = settings) -> GeocodeCache:
+    """Process-wide geocode cache (created on first use)."""
+    global _cache
+    if _cache is None:
+        _cache = GeocodeCache(
+            config.geocode_cache_path,
+            maxsize=config.geocode_cache_size,
+            ttl_sec=config.geocode_cache_ttl_sec,
+            negative_ttl_sec=config.geocode_negative_ttl_sec,
+        )
+    return _cache
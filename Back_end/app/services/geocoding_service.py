@@ -1,20 +1,263 @@
 """Service for geocoding and campus location finding."""
 
+import asyncio
 import logging
-from typing import Optional, Tuple, Dict, List
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Dict, List
 import httpx
 
 from app.config import settings
 from app.exceptions import GeocodingError
+from app.services.geocode_cache import GeocodeResult, get_geocode_cache, normalize_query
+from app.services.nominatim_queue import get_nominatim_queue
 from app.utils.campus_data import CAMPUSES
-from app.utils.geo_utils import haversine_distance
+from app.utils.campus_index import get_campus_index
+from app.utils.city_gazetteer import get_city_gazetteer, normalize_place
+from app.utils.geo_utils import country_name
+from app.utils.postal_gazetteer import get_postal_gazetteer
 
 logger = logging.getLogger(__name__)
 
 
+FRENCH_API = "api_adresse"
+NOMINATIM = "nominatim"
+
+
+async def _query_french_api(client: httpx.AsyncClient, query: str) -> Optional[GeocodeResult]:
+    """api-adresse.data.gouv.fr: acceptable French result, or None."""
+    resp = await client.get(
+        f"https://api-adresse.data.gouv.fr/search/?q={query}&limit=1"
+    )
+    data = resp.json()
+    if not data.get('features'):
+        return None
+
+    props = data['features'][0]['properties']
+    result_type = props.get('type')
+    user_city_name = props.get('city', '')
+    normalized_query = query.lower().strip()
+
+    # Anti false-positive validation: a street match whose city is not the query
+    # ("Berlin" -> "Rue de Berlin") is rejected, unless the query is a zip code
+    if (
+        result_type == 'street'
+        and normalized_query not in user_city_name.lower()
+        and not query.isdigit()
+    ):
+        return None
+
+    lon, lat = data['features'][0]['geometry']['coordinates']
+    return GeocodeResult(coords=(float(lon), float(lat)), label=props.get('label'), country="France")
+
+
+async def _query_nominatim(client: httpx.AsyncClient, query: str) -> Optional[GeocodeResult]:
+    """
+    OpenStreetMap Nominatim (worldwide): first result, or None.
+    Goes through the process-wide rate-limited queue (own client), so `client` is unused;
+    raises NominatimThrottled when no request slot is free in time.
+    """
+    data_osm = await get_nominatim_queue().search(query)
+    if not data_osm:
+        return None
+
+    # ISO country code from the address details, not the localized display name
+    address = data_osm[0].get('address') or {}
+    return GeocodeResult(
+        coords=(float(data_osm[0]['lon']), float(data_osm[0]['lat'])),
+        label=data_osm[0]['display_name'],
+        country=country_name(address.get('country_code', '')),
+    )
+
+
+# Call order in sequential mode
+PROVIDERS: Dict[str, Callable[[httpx.AsyncClient, str], Awaitable[Optional[GeocodeResult]]]] = {
+    FRENCH_API: _query_french_api,
+    NOMINATIM: _query_nominatim,
+}
+
+
+class GeocoderStats:
+    """Per-provider latency and outcome counters, plus how often each provider's answer was used."""
+
+    def __init__(self, providers: List[str]):
+        self.races = 0
+        self.unresolved = 0
+        self._providers: Dict[str, Dict[str, float]] = {
+            name: {"calls": 0, "answers": 0, "empty": 0, "errors": 0, "cancelled": 0, "wins": 0, "latency_ms_total": 0.0}
+            for name in providers
+        }
+
+    async def timed(self, provider: str, call: Awaitable[Optional[GeocodeResult]]) -> Optional[GeocodeResult]:
+        """Await one provider call, recording its latency and outcome."""
+        stats = self._providers[provider]
+        stats["calls"] += 1
+        start = time.perf_counter()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            stats["cancelled"] += 1
+            raise
+        except Exception:
+            stats["errors"] += 1
+            raise
+        stats["latency_ms_total"] += (time.perf_counter() - start) * 1000
+        stats["answers" if result is not None else "empty"] += 1
+        return result
+
+    def record_race(self, winner: Optional[str]) -> None:
+        self.races += 1
+        if winner is None:
+            self.unresolved += 1
+        else:
+            self._providers[winner]["wins"] += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        providers = {}
+        for name, stats in self._providers.items():
+            completed = stats["answers"] + stats["empty"]
+            providers[name] = {
+                **{k: int(v) for k, v in stats.items() if k != "latency_ms_total"},
+                "latency_ms_avg": round(stats["latency_ms_total"] / completed, 1) if completed else None,
+                "win_rate": round(stats["wins"] / self.races, 3) if self.races else 0.0,
+            }
+        return {"mode": "race" if settings.geocode_race else "sequential", "lookups": self.races,
+                "unresolved": self.unresolved, "providers": providers}
+
+
+geocoder_stats = GeocoderStats(list(PROVIDERS))
+
+
 class GeocodingService:
     """Service for finding nearest Epitech campus based on location."""
 
+    @staticmethod
+    async def geocode(query: str) -> GeocodeResult:
+        """
+        Resolve a location query to coordinates, label and country.
+
+        Known French postal codes and city names are answered from the bundled
+        gazetteers. Results (including "not found") are cached by normalized query; a lookup
+        where an API call failed (or Nominatim was throttled) is not cached as negative, so it
+        is retried; meanwhile it falls back to a city named by the query's leading words, and
+        is "not found" otherwise.
+        """
+        # French postal codes: offline table first (no network, no cache round trip)
+        postal_code = query.strip()
+        if len(postal_code) == 5 and postal_code.isdigit():
+            hit = get_postal_gazetteer(settings.postal_gazetteer_path or None).lookup(postal_code)
+            if hit is not None:
+                lat, lon, label = hit
+                return GeocodeResult(coords=(lon, lat), label=label, country="France")
+
+        # City names: offline gazetteer ("Toulouse", "Köln", "Lyon, France" -> "Lyon")
+        cities = get_city_gazetteer(settings.city_gazetteer_path or None)
+        place = cities.lookup(query)
+        if place is None and "," in query:
+            # "Lyon, France" -> Lyon; "Orange, Texas" is left to the online geocoders
+            head, rest = query.split(",", 1)
+            place = cities.lookup(head)
+            if place is not None and normalize_place(rest) != normalize_place(country_name(place.country_code)):
+                place = None
+        if place is not None:
+            country = country_name(place.country_code)
+            return GeocodeResult(coords=(place.lon, place.lat), label=f"{place.name}, {country}", country=country)
+
+        cache = get_geocode_cache()
+        cached = await cache.get(query)
+        if cached is not None:
+            return cached
+
+        result, complete = await GeocodingService._geocode_remote(query)
+        if result.found or complete:
+            await cache.put(query, result)
+            return result
+
+        # Online lookup failed or was throttled: a city named by the leading words, not cached.
+        # No prefix completion here: "Saint" or "la" would become Saint Petersburg or Lagos.
+        place = cities.match_leading(query)
+        if place is not None:
+            logger.info(f"Geocoding unavailable, local fallback for {query!r}: {place.name}")
+            country = country_name(place.country_code)
+            return GeocodeResult(coords=(place.lon, place.lat), label=f"{place.name}, {country}", country=country)
+        return result
+
+    @staticmethod
+    async def _geocode_remote(query: str) -> Tuple[GeocodeResult, bool]:
+        """
+        Call the geocoding APIs. Returns (result, complete); complete is False if an API call failed.
+
+        Racing mode (default) queries api-adresse.data.gouv.fr and Nominatim at the same
+        time and keeps the first acceptable answer, cancelling the other call. A Nominatim
+        answer located in France (or for a zip code) still waits for the French API, which
+        stays authoritative there. Sequential mode calls Nominatim only when the French API
+        has no acceptable answer.
+        """
+        async with httpx.AsyncClient(timeout=settings.geocoding_timeout) as client:
+            if settings.geocode_race:
+                return await GeocodingService._race(client, query)
+            return await GeocodingService._sequential(client, query)
+
+    @staticmethod
+    async def _sequential(client: httpx.AsyncClient, query: str) -> Tuple[GeocodeResult, bool]:
+        complete = True
+        for provider in (FRENCH_API, NOMINATIM):
+            try:
+                result = await geocoder_stats.timed(provider, PROVIDERS[provider](client, query))
+            except Exception as e:
+                complete = False
+                logger.debug(f"{provider} geocoding failed: {e}")
+                continue
+            if result is not None:
+                geocoder_stats.record_race(provider)
+                return result, True
+            if provider == FRENCH_API:
+                logger.info(f"Switching to Nominatim for: {query}")
+        geocoder_stats.record_race(None)
+        return GeocodeResult(coords=None), complete
+
+    @staticmethod
+    async def _race(client: httpx.AsyncClient, query: str) -> Tuple[GeocodeResult, bool]:
+        tasks = {
+            asyncio.create_task(geocoder_stats.timed(provider, fetch(client, query))): provider
+            for provider, fetch in PROVIDERS.items()
+        }
+        pending = set(tasks)
+        complete = True
+        winner: Optional[Tuple[str, GeocodeResult]] = None
+        held: Optional[GeocodeResult] = None  # Nominatim answer waiting for the French API's verdict
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        complete = False
+                        logger.debug(f"{provider} geocoding failed: {e}")
+                        continue
+                    if result is None:
+                        continue
+                    if provider == NOMINATIM and (result.country == "France" or query.strip().isdigit()):
+                        held = result
+                        continue
+                    winner = (provider, result)
+                    break
+        finally:
+            # Loser (or everything, if the caller was cancelled): stop the HTTP calls still in flight
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None and held is not None:
+            winner = (NOMINATIM, held)
+        if winner is None:
+            geocoder_stats.record_race(None)
+            return GeocodeResult(coords=None), complete
+        geocoder_stats.record_race(winner[0])
+        return winner[1], True
+
     @staticmethod
     async def get_nearest_campus(
         query: str
@@ -30,106 +273,94 @@ class GeocodingService:
             or None if geocoding fails
         """
         try:
-            user_coords = None
-            user_label = "Localisation inconnue"
-            user_country_detected = "Inconnu"
-
-            async with httpx.AsyncClient(timeout=settings.geocoding_timeout) as client:
-                # 1. Try French API (api-adresse.data.gouv.fr)
-                valid_french_result = False
-                try:
-                    resp = await client.get(
-                        f"https://api-adresse.data.gouv.fr/search/?q={query}&limit=1"
-                    )
-                    data = resp.json()
-
-                    if data.get('features'):
-                        props = data['features'][0]['properties']
-                        result_type = props.get('type')
-                        user_city_name = props.get('city', '')
-                        normalized_query = query.lower().strip()
-
-                        # Anti false-positive validation
-                        if not (
-                            result_type == 'street'
-                            and normalized_query not in user_city_name.lower()
-                        ):
-                            valid_french_result = True
-                            user_coords = data['features'][0]['geometry']['coordinates']
-                            user_label = props.get('label')
-                            user_country_detected = "France"
-                        else:
-                            # If rejected as false positive, check if it's a zip code
-                            if query.isdigit():
-                                valid_french_result = True
-                                user_coords = data['features'][0]['geometry']['coordinates']
-                                user_label = props.get('label')
-                                user_country_detected = "France"
-                except Exception as e:
-                    logger.debug(f"French geocoding API failed: {e}")
-
-                # 2. If French API failed, try OpenStreetMap (Worldwide)
-                if not valid_french_result:
-                    logger.info(f"Switching to Nominatim for: {query}")
-                    try:
-                        headers = {'User-Agent': 'EpiChat/1.0'}
-                        resp_osm = await client.get(
-                            f"https://nominatim.openstreetmap.org/search?q={query}&format=json&limit=1",
-                            headers=headers
-                        )
-                        data_osm = resp_osm.json()
-
-                        if data_osm:
-                            user_coords = [
-                                float(data_osm[0]['lon']),
-                                float(data_osm[0]['lat'])
-                            ]
-                            user_label = data_osm[0]['display_name']
-                            # Simple country detection from display name
-                            if "Germany" in user_label or "Deutschland" in user_label:
-                                user_country_detected = "Allemagne"
-                            elif "Spain" in user_label or "España" in user_label:
-                                user_country_detected = "Espagne"
-                            elif "Belgium" in user_label or "Belgique" in user_label:
-                                user_country_detected = "Belgique"
-                            else:
-                                user_country_detected = "Autre"
-                    except Exception as e:
-                        logger.debug(f"OpenStreetMap geocoding failed: {e}")
+            geo = await GeocodingService.geocode(query)
 
-            if not user_coords:
+            if not geo.found:
                 logger.warning(f"Could not geocode location: {query}")
                 return None
 
-            user_lon, user_lat = user_coords[0], user_coords[1]
-            user_detected_info = f"{user_label} (Pays: {user_country_detected})"
-
-            # 3. Calculate distances to ALL campuses
-            results: List[Dict] = []
-            for city, info in CAMPUSES.items():
-                camp_lat, camp_lon = info['coords']
-                dist = haversine_distance(user_lat, user_lon, camp_lat, camp_lon)
-                results.append({
-                    'city': city,
-                    'dist': int(dist),
-                    'data': info
-                })
+            user_lon, user_lat = geo.coords
+            user_country_detected = geo.country
+            user_detected_info = f"{geo.label} (Pays: {user_country_detected})"
 
-            # Sort by distance
-            results.sort(key=lambda x: x['dist'])
+            # 3. Distances to ALL campuses (precomputed index), nearest overall and in the user's country
+            overall, in_country = get_campus_index().search([user_lat], [user_lon], [user_country_detected])
+            overall = overall.row(0)[0]
+            in_country = in_country.row(0)
+            nearest_overall = {
+                'city': overall['city'],
+                'dist': int(overall['dist_km']),
+                'data': CAMPUSES[overall['city']]
+            }
 
-            nearest_overall = results[0]
-
-            # Find nearest campus IN USER'S COUNTRY (if known)
             nearest_in_country = None
-            if user_country_detected and user_country_detected != "Autre":
-                nearest_in_country = next(
-                    (r for r in results if r['data']['country'] == user_country_detected),
-                    None
-                )
+            if in_country:
+                nearest_in_country = {
+                    'city': in_country[0]['city'],
+                    'dist': int(in_country[0]['dist_km']),
+                    'data': CAMPUSES[in_country[0]['city']]
+                }
 
             return (nearest_overall, nearest_in_country, user_detected_info)
 
         except Exception as e:
             logger.error(f"Geocoding error: {e}")
             raise GeocodingError(f"Failed to geocode location: {str(e)}")
+
+    @staticmethod
+    async def nearest_campuses_batch(
+        queries: List[str],
+        k: int = 1,
+        concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Nearest campuses for many location queries (CRM enrichment).
+
+        Identical queries (after normalization) are geocoded once, with at most
+        `concurrency` lookups in flight; postal codes and known cities resolve
+        offline. Distances for the whole batch are computed in one array pass.
+
+        Returns one dict per query, in input order:
+            {query, found, label, country, nearest: [{city, country, dist_km}], nearest_in_country: [...]}
+        """
+        sem = asyncio.Semaphore(concurrency or settings.geocode_batch_concurrency)
+        unique: Dict[str, str] = {}
+        for query in queries:
+            unique.setdefault(normalize_query(query), query)
+
+        async def resolve(query: str) -> GeocodeResult:
+            async with sem:
+                try:
+                    return await GeocodingService.geocode(query)
+                except Exception as e:
+                    logger.warning(f"Batch geocoding failed for {query!r}: {e}")
+                    return GeocodeResult(coords=None)
+
+        geocoded = dict(zip(unique, await asyncio.gather(*[resolve(q) for q in unique.values()])))
+
+        found = [key for key, geo in geocoded.items() if geo.found]
+        rows: Dict[str, Tuple[List[Dict], List[Dict]]] = {}
+        if found:
+            lons, lats = zip(*(geocoded[key].coords for key in found))
+            countries = [geocoded[key].country for key in found]
+            overall, in_country = get_campus_index().search(lats, lons, countries, k)
+            for i, key in enumerate(found):
+                rows[key] = (overall.row(i), in_country.row(i))
+
+        def with_country(matches: List[Dict]) -> List[Dict]:
+            return [{**m, 'country': CAMPUSES[m['city']]['country']} for m in matches]
+
+        results = []
+        for query in queries:
+            key = normalize_query(query)
+            geo = geocoded[key]
+            nearest, nearest_in_country = rows.get(key, ([], []))
+            results.append({
+                'query': query,
+                'found': geo.found,
+                'label': geo.label if geo.found else None,
+                'country': geo.country if geo.found else None,
+                'nearest': with_country(nearest),
+                'nearest_in_country': with_country(nearest_in_country),
+            })
+        return results
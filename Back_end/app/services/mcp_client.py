@@ -0,0 +1,147 @@
+"""Shared HTTP client for the MCP tools server."""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+class MCPClient:
+    """
+    One pooled keep-alive client for every MCP tool call.
+
+    Created once in the FastAPI lifespan (see `app.main`) and shared by the
+    Campus/Degrees/Pedagogy/ValuesService classes through `get_mcp_client()`.
+    Each tool has its own timeout, and per-tool counters plus connection reuse
+    stats are exposed through `stats()`.
+    """
+
+    def __init__(self, config: Settings):
+        self.base_url = config.mcp_server_url.rstrip("/")
+        self.default_timeout = config.mcp_timeout
+        self.tool_timeouts = dict(config.mcp_tool_timeouts)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=config.mcp_timeout,
+            limits=httpx.Limits(
+                max_connections=config.mcp_max_connections,
+                max_keepalive_connections=config.mcp_max_keepalive_connections,
+                keepalive_expiry=config.mcp_keepalive_expiry,
+            ),
+        )
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._connections_opened = 0
+        self._responses = 0
+        self._tools: Dict[str, Dict[str, float]] = {}
+
+    def tool_url(self, tool: str) -> str:
+        return f"{self.base_url}/scrape/{tool}"
+
+    def timeout_for(self, tool: str) -> float:
+        return float(self.tool_timeouts.get(tool, self.default_timeout))
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        # httpcore trace hook: a TCP connect only happens when no pooled connection was reusable.
+        if event_name == "connection.connect_tcp.complete":
+            self._connections_opened += 1
+
+    async def request(self, method: str, path: str, tool: str, **kwargs: Any) -> httpx.Response:
+        """Send a request to the MCP server with the tool's timeout; counters are updated either way."""
+        counters = self._tools.setdefault(tool, {"requests": 0, "errors": 0, "total_ms": 0.0})
+        counters["requests"] += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        start = time.perf_counter()
+        try:
+            response = await self._client.request(
+                method,
+                path,
+                timeout=kwargs.pop("timeout", self.timeout_for(tool)),
+                extensions={"trace": self._trace},
+                **kwargs,
+            )
+            self._responses += 1
+            return response
+        except Exception:
+            counters["errors"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            counters["total_ms"] += (time.perf_counter() - start) * 1000
+
+    async def post_tool(self, tool: str) -> httpx.Response:
+        """POST /scrape/<tool>."""
+        return await self.request("POST", f"/scrape/{tool}", tool)
+
+    async def get_changes(self, tool: str, since: int) -> httpx.Response:
+        """GET /scrape/<tool>/changes?since=<version> (cheap revalidation of a cached payload)."""
+        return await self.request("GET", f"/scrape/{tool}/changes", tool, params={"since": since})
+
+    async def post_batch(self, tools: List[str], since: Optional[Dict[str, int]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        POST /scrape/batch: several tools in one round trip (one JSON decode).
+        Returns tool -> {data, meta} | {unchanged, meta} | {error, status}; transport errors raise.
+        """
+        # The batch waits for its slowest tool: use the largest per-tool timeout.
+        timeout = max(self.timeout_for(tool) for tool in tools)
+        response = await self.request(
+            "POST",
+            "/scrape/batch",
+            "batch",
+            json={"tools": tools, "since": since or {}},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json().get("results", {})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "connections_opened": self._connections_opened,
+            "connections_reused": max(0, self._responses - self._connections_opened),
+            "tools": {
+                tool: {
+                    "requests": int(c["requests"]),
+                    "errors": int(c["errors"]),
+                    "avg_ms": round(c["total_ms"] / c["requests"], 1) if c["requests"] else 0.0,
+                    "timeout_sec": self.timeout_for(tool),
+                }
+                for tool, c in self._tools.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: Optional[MCPClient] = None
+
+
+def init_mcp_client(config: Settings = settings) -> MCPClient:
+    """Create the process-wide client (called from the app lifespan)."""
+    global _client
+    _client = MCPClient(config)
+    return _client
+
+
+def get_mcp_client() -> MCPClient:
+    """Return the shared client, creating it on first use outside the app lifespan (scripts)."""
+    global _client
+    if _client is None:
+        _client = MCPClient(settings)
+    return _client
+
+
+async def close_mcp_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
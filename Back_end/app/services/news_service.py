@@ -1,86 +1,89 @@
-"""Service for fetching Epitech news."""
+"""Service for fetching Epitech news from MCP Server."""
 
-import asyncio
-import json
-import os
 import logging
-from typing import List, Dict
+import time
+from typing import Any, Dict, Optional
+
+import httpx
 
 from app.config import settings
 from app.exceptions import NewsServiceError
+from app.services.mcp_client import get_mcp_client
+from app.services.tool_cache import get_tool_cache
 
 logger = logging.getLogger(__name__)
 
 
 class NewsService:
-    """Service for scraping Epitech news."""
+    """Thin client for the MCP `news` tool (scraped and cached server-side)."""
 
-    @staticmethod
-    async def get_epitech_news() -> str:
+    async def get_epitech_news(self) -> str:
         """
-        Fetch latest Epitech news using Scrapy scraper.
-        
+        Fetch latest Epitech news, served from the backend tool cache when still valid.
+
         Returns:
             Formatted news string
-        
+
+        Raises:
+            NewsServiceError: If no news could be obtained from MCP
+        """
+        start_time = time.time()
+        payload = await self.get_news_payload()
+        return self.format_news(payload, time.time() - start_time)
+
+    async def get_news_payload(self) -> Optional[Dict[str, Any]]:
+        """Raw MCP payload ({data, meta}) from the tool cache, or None when MCP failed."""
+        return await get_tool_cache().get("news", self._fetch_news)
+
+    @staticmethod
+    def format_news(payload: Optional[Dict[str, Any]], elapsed_time: float) -> str:
+        """
+        Format an MCP news payload (from `get_news_payload` or a batched MCP call) for the prompt.
+
         Raises:
-            NewsServiceError: If scraping fails
+            NewsServiceError: If the payload is missing (MCP failed)
         """
+        if payload is None:
+            print(f"   ❌ Actualités indisponibles après {elapsed_time:.2f}s")
+            raise NewsServiceError("Failed to fetch news from MCP Server")
+
+        news_data = payload.get("data") if isinstance(payload, dict) else None
+        if not news_data:
+            print(f"   ⚠️  Aucune actualité trouvée après {elapsed_time:.2f}s")
+            return "Aucune actualité disponible pour le moment."
+
+        # Format news items
+        formatted_news = "Voici les dernières actualités Epitech récupérées en direct :\n"
+        items_count = min(len(news_data), settings.max_news_items)
+        for item in news_data[:settings.max_news_items]:
+            title = (item.get("title") or "Sans titre").strip()
+            summary = (item.get("summary") or "").strip()
+            link = item.get("link") or "#"
+            formatted_news += f"- {title}: {summary} (Source: {link})\n"
+
+        print(f"   ✓ {items_count} actualités récupérées en {elapsed_time:.2f}s")
+
+        return formatted_news
+
+    async def _fetch_news(self) -> Optional[Dict[str, Any]]:
+        mcp = get_mcp_client()
+        url = mcp.tool_url("news")
+        logger.info("Calling MCP Server at %s for news data...", url)
         try:
-            import time
-            start_time = time.time()
-            
-            scraper_path = os.path.join(
-                os.path.dirname(__file__),
-                "../../..",
-                settings.scraper_path.lstrip("../")
-            )
-            scraper_path = os.path.abspath(scraper_path)
-            
-            print(f"   📡 Chemin scraper: {scraper_path}")
-            logger.info(f"Running Scrapy scraper from: {scraper_path}")
-            
-            # Run Scrapy asynchronously
-            print("   ⏳ Lancement de Scrapy...")
-            process = await asyncio.create_subprocess_exec(
-                "python", "-m", "scrapy", "crawl", "epitech_news", "-O", "-", "-t", "json",
-                cwd=scraper_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            elapsed_time = time.time() - start_time
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
-                print(f"   ❌ Erreur Scrapy après {elapsed_time:.2f}s: {error_msg[:100]}")
-                logger.error(f"Scrapy error: {error_msg}")
-                raise NewsServiceError(f"Failed to fetch news: {error_msg}")
-            
-            # Parse JSON from stdout
-            news_data = json.loads(stdout.decode())
-            
-            if not news_data:
-                print(f"   ⚠️  Aucune actualité trouvée après {elapsed_time:.2f}s")
-                return "Aucune actualité disponible pour le moment."
-            
-            # Format news items
-            formatted_news = "Voici les dernières actualités Epitech récupérées en direct :\n"
-            items_count = min(len(news_data), settings.max_news_items)
-            for item in news_data[:settings.max_news_items]:
-                title = item.get('title', 'Sans titre').strip()
-                summary = item.get('summary', '').strip()
-                link = item.get('link', '#')
-                formatted_news += f"- {title}: {summary} (Source: {link})\n"
-            
-            print(f"   ✓ {items_count} actualités récupérées en {elapsed_time:.2f}s")
-            
-            return formatted_news
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse news JSON: {e}")
-            raise NewsServiceError("Failed to parse news data")
+            response = await mcp.post_tool("news")
+
+            if response.status_code != 200:
+                logger.error(
+                    "MCP Server returned error for news: %s - %s",
+                    response.status_code,
+                    response.text,
+                )
+                return None
+
+            return response.json()
+        except httpx.RequestError as e:
+            logger.error("Failed to connect to MCP Server (news): %s", e)
+            return None
         except Exception as e:
-            logger.error(f"Unexpected error fetching news: {e}")
-            raise NewsServiceError(f"Unexpected error: {str(e)}")
+            logger.error("Unexpected error in NewsService: %s", e)
+            return None
@@ -0,0 +1,186 @@
+"""Process-wide outbound queue for Nominatim (OpenStreetMap geocoding).
+
+Nominatim's usage policy allows about one request per second per application.
+Every Nominatim call goes through `NominatimQueue.search`, which:
+
+- spaces requests with a token bucket (`NOMINATIM_RATE_PER_SEC`, `NOMINATIM_BURST`);
+- bounds the wait for a slot (`NOMINATIM_MAX_WAIT_SEC`): a caller that would
+  wait longer fails fast with `NominatimThrottled` and uses a local fallback;
+- coalesces identical queries already in flight into one request.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import Settings, settings
+from app.services.geocode_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+
+
+class NominatimThrottled(Exception):
+    """No request slot available within the caller's wait budget."""
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket: `reserve` books the next slot and says how long
+    to wait for it, so waiters are served in arrival order at `rate` per second.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Book one token; returns the wait (seconds) before using it, or None if above `max_wait`."""
+        self._refill()
+        wait = max(0.0, (1.0 - self._tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self._tokens -= 1.0
+        return wait
+
+    def refund(self) -> None:
+        """Give back a reserved token that was not used (its caller left before sending)."""
+        self._refill()
+        self._tokens = min(self.burst, self._tokens + 1.0)
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+@dataclass
+class _InFlight:
+    task: "asyncio.Task[List[Dict[str, Any]]]"
+    waiters: int = 0
+
+
+class NominatimQueue:
+    """Rate-limited, deduplicating Nominatim client (see module docstring)."""
+
+    def __init__(self, config: Settings = settings):
+        self.max_wait_sec = config.nominatim_max_wait_sec
+        self.timeout = config.geocoding_timeout
+        self._bucket = TokenBucket(config.nominatim_rate_per_sec, config.nominatim_burst)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight: Dict[str, _InFlight] = {}
+        self.stats: Dict[str, float] = {
+            "requests": 0, "coalesced": 0, "throttled": 0, "errors": 0, "cancelled": 0, "refunded": 0,
+            "wait_ms_total": 0.0,
+        }
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, headers={"User-Agent": "EpiChat/1.0"})
+        return self._client
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Nominatim `search` results for `query` (format=json, limit=1, addressdetails=1).
+        Raises NominatimThrottled when no slot is free within the wait budget.
+        """
+        key = normalize_query(query)
+        entry = self._in_flight.get(key)
+        # a finished or cancelled request is never joined: its waiters would get its CancelledError
+        if entry is None or entry.task.done() or entry.task.cancelling():
+            entry = _InFlight(asyncio.create_task(self._run(key, query)))
+            self._in_flight[key] = entry
+        else:
+            self.stats["coalesced"] += 1
+        entry.waiters += 1
+        try:
+            # shield: one waiter giving up (e.g. the losing side of a geocoder race)
+            # must not cancel the request for the others
+            return await asyncio.shield(entry.task)
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.task.done():
+                # unregister before cancelling, so a caller arriving now starts a fresh request
+                if self._in_flight.get(key) is entry:
+                    del self._in_flight[key]
+                entry.task.cancel()
+
+    async def _run(self, key: str, query: str) -> List[Dict[str, Any]]:
+        reserved = sent = False
+        try:
+            wait = self._bucket.reserve(self.max_wait_sec)
+            if wait is None:
+                self.stats["throttled"] += 1
+                raise NominatimThrottled(f"Nominatim busy: no slot within {self.max_wait_sec:g}s")
+            reserved = True
+            self.stats["wait_ms_total"] += wait * 1000
+            if wait:
+                await asyncio.sleep(wait)
+            sent = True
+            self.stats["requests"] += 1
+            try:
+                resp = await self._http().get(
+                    SEARCH_URL, params={"q": query, "format": "json", "limit": 1, "addressdetails": 1}
+                )
+                resp.raise_for_status()
+                return resp.json()
+            except (httpx.HTTPError, ValueError):
+                self.stats["errors"] += 1
+                raise
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            if reserved and not sent:
+                # Cancelled while waiting for its slot (e.g. a lost geocoder race): the slot
+                # goes back to the bucket instead of delaying the next real lookup
+                self._bucket.refund()
+                self.stats["refunded"] += 1
+            raise
+        finally:
+            # only our own entry: a newer request for the same key may have replaced it
+            entry = self._in_flight.get(key)
+            if entry is not None and entry.task is asyncio.current_task():
+                del self._in_flight[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        waited = self.stats["requests"] + self.stats["cancelled"]
+        return {
+            **{k: int(v) for k, v in self.stats.items() if k != "wait_ms_total"},
+            "wait_ms_avg": round(self.stats["wait_ms_total"] / waited, 1) if waited else 0.0,
+            "in_flight": len(self._in_flight),
+            "tokens": round(self._bucket.tokens, 2),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_queue: Optional[NominatimQueue] = None
+
+
+def get_nominatim_queue() -> NominatimQueue:
+    """Process-wide queue (one token bucket for the whole backend process)."""
+    global _queue
+    if _queue is None:
+        _queue = NominatimQueue(settings)
+    return _queue
+
+
+async def close_nominatim_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.aclose()
+        _queue = None
@@ -0,0 +1,147 @@
+"""Async HTTP client for the Ollama API (/api/chat)."""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaResponseError(Exception):
+    """Ollama answered with an error (unknown model, bad request, ...)."""
+
+
+class OllamaClient:
+    """
+    One pooled client for every generation, with a concurrency gate.
+
+    At most `ollama_max_parallel` generations are sent at once (match the
+    server's OLLAMA_NUM_PARALLEL); further calls wait for a slot. Calls are
+    plain coroutines, so cancelling one (e.g. `asyncio.wait_for` hitting
+    `ollama_timeout`, or a client leaving a stream) closes the HTTP request,
+    and Ollama stops generating for it.
+    """
+
+    def __init__(self, config: Settings):
+        self.model = config.ollama_model
+        self.max_parallel = config.ollama_max_parallel
+        self._gate = asyncio.Semaphore(config.ollama_max_parallel)
+        self._client = httpx.AsyncClient(
+            base_url=config.ollama_url.rstrip("/"),
+            # Generation time is bounded by the caller (ollama_timeout); only connecting is bounded here.
+            timeout=httpx.Timeout(None, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=config.ollama_max_parallel,
+                max_keepalive_connections=config.ollama_max_parallel,
+            ),
+        )
+        self._waiting = 0
+        self._in_flight = 0
+        self.stats: Dict[str, float] = {"requests": 0, "completed": 0, "cancelled": 0, "errors": 0, "wait_ms_total": 0.0}
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one of the `max_parallel` generation slots; counts waits, cancellations and errors."""
+        self.stats["requests"] += 1
+        self._waiting += 1
+        start = time.perf_counter()
+        try:
+            await self._gate.acquire()
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            raise
+        finally:
+            self._waiting -= 1
+        self.stats["wait_ms_total"] += (time.perf_counter() - start) * 1000
+        self._in_flight += 1
+        try:
+            yield
+            self.stats["completed"] += 1
+        except (asyncio.CancelledError, GeneratorExit):
+            self.stats["cancelled"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._gate.release()
+
+    @staticmethod
+    def _raise_for_error(resp: httpx.Response, body: bytes) -> None:
+        if resp.status_code >= 400:
+            try:
+                detail = json.loads(body).get("error") or body.decode(errors="replace")
+            except (ValueError, AttributeError):
+                detail = body.decode(errors="replace")
+            raise OllamaResponseError(f"{resp.status_code}: {detail}")
+
+    async def chat(self, messages: List[Dict[str, str]], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Full (non-streamed) chat completion: Ollama's final JSON ({message: {content}, ...})."""
+        payload = {"model": self.model, "messages": messages, "options": options or {}, "stream": False}
+        async with self._slot():
+            resp = await self._client.post("/api/chat", json=payload)
+            self._raise_for_error(resp, resp.content)
+            return resp.json()
+
+    async def chat_stream(
+        self, messages: List[Dict[str, str]], options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streamed chat completion: Ollama's JSON lines, the last one has `done: true`."""
+        payload = {"model": self.model, "messages": messages, "options": options or {}, "stream": True}
+        async with self._slot():
+            async with self._client.stream("POST", "/api/chat", json=payload) as resp:
+                if resp.status_code >= 400:
+                    self._raise_for_error(resp, await resp.aread())
+                async for line in resp.aiter_lines():
+                    if not line.strip():
+                        continue
+                    part = json.loads(line)
+                    if part.get("error"):
+                        raise OllamaResponseError(part["error"])
+                    yield part
+
+    def snapshot(self) -> Dict[str, Any]:
+        started = self.stats["requests"] - self._waiting
+        return {
+            "max_parallel": self.max_parallel,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            **{k: int(v) for k, v in self.stats.items() if k != "wait_ms_total"},
+            "wait_ms_avg": round(self.stats["wait_ms_total"] / started, 1) if started > 0 else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: Optional[OllamaClient] = None
+
+
+def init_ollama_client(config: Settings = settings) -> OllamaClient:
+    """Create the process-wide client (called from the app lifespan)."""
+    global _client
+    _client = OllamaClient(config)
+    return _client
+
+
+def get_ollama_client() -> OllamaClient:
+    """Return the shared client, creating it on first use outside the app lifespan (scripts)."""
+    global _client
+    if _client is None:
+        _client = OllamaClient(settings)
+    return _client
+
+
+async def close_ollama_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
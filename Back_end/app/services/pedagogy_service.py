@@ -5,20 +5,25 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from app.services.mcp_client import get_mcp_client
+from app.services.tool_cache import get_tool_cache
+
 logger = logging.getLogger(__name__)
 
 
 class PedagogyService:
     """Service for interacting with the Pedagogy tool exposed by MCP Server."""
 
-    MCP_SERVER_URL = "http://localhost:8001"
-
     async def get_pedagogy_info(self) -> Optional[Dict[str, Any]]:
-        url = f"{self.MCP_SERVER_URL}/scrape/pedagogy"
+        """Return the pedagogy payload, served from the backend tool cache when still valid."""
+        return await get_tool_cache().get("pedagogy", self._fetch_pedagogy)
+
+    async def _fetch_pedagogy(self) -> Optional[Dict[str, Any]]:
+        mcp = get_mcp_client()
+        url = mcp.tool_url("pedagogy")
         logger.info("Calling MCP Server at %s for pedagogy data...", url)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url)
+            response = await mcp.post_tool("pedagogy")
 
             if response.status_code != 200:
                 logger.error(
@@ -0,0 +1,290 @@
+"""Backend cache for MCP tool results, keyed by MCP snapshot version."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import Settings, settings
+from app.services.circuit_breaker import breakers
+from app.services.mcp_client import get_mcp_client
+
+logger = logging.getLogger(__name__)
+
+Payload = Dict[str, Any]
+
+
+def snapshot_version(payload: Any) -> Optional[int]:
+    """MCP `meta.snapshot_version` of a tool payload (None for payloads without one)."""
+    meta = payload.get("meta") if isinstance(payload, dict) else None
+    version = meta.get("snapshot_version") if isinstance(meta, dict) else None
+    return version if isinstance(version, int) else None
+
+
+@dataclass
+class _Entry:
+    payload: Payload
+    version: Optional[int]
+    checked_at: float
+    # Post-processed forms of this payload (e.g. optimized campus list), built once per version
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+class ToolCache:
+    """
+    Keeps the last MCP payload per tool for a per-tool TTL.
+
+    Within the TTL the payload is served without any network call. Once the TTL
+    is over, the entry is revalidated with `GET /scrape/<tool>/changes?since=<version>`:
+    if the MCP snapshot version did not move, the entry (and everything derived
+    from it) is kept for another TTL; otherwise the full payload is fetched again.
+    A failed revalidation counts as a breaker failure and serves the last known good
+    payload, without a full fetch on top.
+
+    Refreshes are single-flight per tool: concurrent callers without a previous payload
+    wait for the same fetch and get its outcome, instead of fetching again one after
+    the other.
+
+    MCP calls are guarded by per-tool circuit breakers (app/services/circuit_breaker.py):
+    an expired payload keeps being served as last known good while MCP is failing.
+    """
+
+    def __init__(self, ttls: Dict[str, float], default_ttl: float = 300.0):
+        self.ttls = dict(ttls)
+        self.default_ttl = default_ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._flights: Dict[str, "asyncio.Future[Optional[Payload]]"] = {}
+        self.stats: Dict[str, int] = {
+            "hits": 0, "joined": 0, "revalidated": 0, "fetched": 0, "batches": 0, "fallbacks": 0,
+        }
+
+    def ttl_for(self, tool: str) -> float:
+        return float(self.ttls.get(tool, self.default_ttl))
+
+    def _is_fresh(self, tool: str, entry: Optional[_Entry]) -> bool:
+        ttl = self.ttl_for(tool)
+        return entry is not None and ttl > 0 and time.time() - entry.checked_at < ttl
+
+    def _store(self, tool: str, payload: Payload) -> None:
+        self._entries[tool] = _Entry(payload=payload, version=snapshot_version(payload), checked_at=time.time())
+
+    def _last_known_good(self, tool: str, entry: Optional[_Entry], reason: str) -> Optional[Payload]:
+        """Serve the last payload we had (even expired) when MCP can't be used right now."""
+        if entry is None:
+            return None
+        self.stats["fallbacks"] += 1
+        print(f"♻️ [Backend] MCP '{tool}' indisponible ({reason}) : dernière valeur connue (v{entry.version})")
+        return entry.payload
+
+    async def get(self, tool: str, fetch: Callable[[], Awaitable[Optional[Payload]]]) -> Optional[Payload]:
+        """
+        Return the cached payload for `tool`, revalidating or calling `fetch` when needed.
+        `fetch` returns the full MCP payload, or None on failure.
+        Calls go through the tool's circuit breaker; when it is open or the call fails, the
+        last known good payload is returned (None if there never was one).
+        A TTL <= 0 disables caching for that tool (the payload is still kept as last known good).
+        """
+        entry = self._entries.get(tool)
+        if self._is_fresh(tool, entry):
+            self.stats["hits"] += 1
+            return entry.payload
+
+        # Single flight: one revalidation/fetch per tool at a time, whose outcome (payload,
+        # None or error) every concurrent caller shares. Callers holding a previous payload
+        # get it right away instead of waiting for a possibly slow MCP call.
+        flight = self._flights.get(tool)
+        if flight is None:
+            flight = self._start_flight(tool, self._refresh(tool, fetch))
+        elif entry is not None:
+            return self._last_known_good(tool, entry, "rafraîchissement en cours")
+        else:
+            self.stats["joined"] += 1
+        # shield: a caller giving up must not cancel the fetch the others are waiting for
+        return await asyncio.shield(flight)
+
+    def _start_flight(self, tool: str, refresh: Awaitable[Optional[Payload]]) -> "asyncio.Future[Optional[Payload]]":
+        flight = asyncio.ensure_future(refresh)
+        self._flights[tool] = flight
+
+        def done(f: "asyncio.Future[Optional[Payload]]") -> None:
+            if self._flights.get(tool) is f:
+                del self._flights[tool]
+            if not f.cancelled():
+                f.exception()  # retrieved here too, in case every caller has left
+
+        flight.add_done_callback(done)
+        return flight
+
+    async def _refresh(self, tool: str, fetch: Callable[[], Awaitable[Optional[Payload]]]) -> Optional[Payload]:
+        """Revalidate or fetch `tool` through its circuit breaker (run once per flight)."""
+        entry = self._entries.get(tool)
+        breaker = breakers.get(tool)
+        if not breaker.allow():
+            return self._last_known_good(tool, entry, "circuit ouvert")
+
+        start = time.perf_counter()
+        settled = False
+        try:
+            if entry is not None and entry.version is not None:
+                unchanged = await self._unchanged(tool, entry.version)
+                if unchanged is None:
+                    # MCP slow or down: don't pay a full fetch timeout on top of this one
+                    breaker.record_failure("revalidation failed")
+                    settled = True
+                    return self._last_known_good(tool, entry, "échec de la revalidation")
+                if unchanged:
+                    breaker.record_success((time.perf_counter() - start) * 1000)
+                    settled = True
+                    entry.checked_at = time.time()
+                    self.stats["revalidated"] += 1
+                    return entry.payload
+
+            payload = await fetch()
+            settled = True
+            if payload is None:
+                breaker.record_failure("MCP call failed")
+                return self._last_known_good(tool, entry, "échec de l'appel")
+            breaker.record_success((time.perf_counter() - start) * 1000)
+            self.stats["fetched"] += 1
+            self._store(tool, payload)
+            return payload
+        finally:
+            if not settled:
+                breaker.release()
+
+    async def get_many(self, tools: List[str]) -> Dict[str, Optional[Payload]]:
+        """
+        Same as `get` for several tools, but everything not fresh in the cache is fetched
+        (or revalidated, via `since`) with a single `POST /scrape/batch`.
+        Tools that failed map to their last known good payload, or None.
+        Tools already being fetched (by `get` or another batch) share that flight.
+        """
+        out: Dict[str, Optional[Payload]] = {}
+        joined: Dict[str, "asyncio.Future[Optional[Payload]]"] = {}
+        todo: List[str] = []
+        since: Dict[str, int] = {}
+        for tool in tools:
+            entry = self._entries.get(tool)
+            flight = self._flights.get(tool)
+            if self._is_fresh(tool, entry):
+                self.stats["hits"] += 1
+                out[tool] = entry.payload
+            elif flight is not None:
+                if entry is not None:
+                    out[tool] = self._last_known_good(tool, entry, "rafraîchissement en cours")
+                else:
+                    self.stats["joined"] += 1
+                    joined[tool] = flight
+            elif not breakers.get(tool).allow():
+                out[tool] = self._last_known_good(tool, entry, "circuit ouvert")
+            else:
+                todo.append(tool)
+                if entry is not None and entry.version is not None:
+                    since[tool] = entry.version
+
+        if todo:
+            batch = asyncio.ensure_future(self._refresh_many(todo, since))
+            for tool in todo:
+                joined[tool] = self._start_flight(tool, self._batch_result(batch, tool))
+        if joined:
+            results = await asyncio.shield(asyncio.gather(*joined.values(), return_exceptions=True))
+            for tool, result in zip(joined, results):
+                out[tool] = None if isinstance(result, BaseException) else result
+        return out
+
+    @staticmethod
+    async def _batch_result(batch: "asyncio.Future[Dict[str, Optional[Payload]]]", tool: str) -> Optional[Payload]:
+        return (await batch)[tool]
+
+    async def _refresh_many(self, todo: List[str], since: Dict[str, int]) -> Dict[str, Optional[Payload]]:
+        """One `POST /scrape/batch` for `todo` (breakers already allowed), results per tool."""
+        self.stats["batches"] += 1
+        start = time.perf_counter()
+        batch_error = None
+        try:
+            results = await get_mcp_client().post_batch(todo, since=since)
+        except asyncio.CancelledError:
+            for tool in todo:
+                breakers.get(tool).release()
+            raise
+        except Exception as e:
+            logger.error("MCP batch call failed for %s: %s", ", ".join(todo), e)
+            batch_error = str(e) or type(e).__name__
+            results = {}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        out: Dict[str, Optional[Payload]] = {}
+        for tool in todo:
+            result = results.get(tool) or {}
+            entry = self._entries.get(tool)
+            breaker = breakers.get(tool)
+            if result.get("unchanged") and entry is not None:
+                breaker.record_success(elapsed_ms)
+                entry.checked_at = time.time()
+                self.stats["revalidated"] += 1
+                out[tool] = entry.payload
+            elif "data" in result:
+                breaker.record_success(elapsed_ms)
+                payload = {"data": result["data"], "meta": result.get("meta", {})}
+                self.stats["fetched"] += 1
+                self._store(tool, payload)
+                out[tool] = payload
+            else:
+                reason = batch_error or result.get("error") or "no result"
+                if result.get("error"):
+                    logger.error("MCP batch: %s failed (%s): %s", tool, result.get("status"), result.get("error"))
+                breaker.record_failure(reason)
+                out[tool] = self._last_known_good(tool, entry, "échec de l'appel")
+        return out
+
+    async def _unchanged(self, tool: str, version: int) -> Optional[bool]:
+        """
+        Whether the MCP snapshot of `tool` is still at `version`; None when the revalidation
+        call itself failed (transport error, timeout, 5xx).
+        """
+        try:
+            response = await get_mcp_client().get_changes(tool, since=version)
+            if response.status_code >= 500:
+                logger.warning("Tool cache revalidation failed for %s: HTTP %s", tool, response.status_code)
+                return None
+            if response.status_code != 200:
+                return False
+            body = response.json()
+        except Exception as e:
+            logger.warning("Tool cache revalidation failed for %s: %s", tool, e)
+            return None
+        return body.get("version") == version and not body.get("changed") and not body.get("removed")
+
+    def derived(self, tool: str, name: str, payload: Any, build: Callable[[Any], Any]) -> Any:
+        """
+        Memoize `build(payload)` for the cached payload of `tool` (dropped when the version changes).
+        Payloads that are not the cached object are processed without memoization.
+        """
+        entry = self._entries.get(tool)
+        if entry is None or entry.payload is not payload:
+            return build(payload)
+        if name not in entry.derived:
+            entry.derived[name] = build(payload)
+        return entry.derived[name]
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            **self.stats,
+            "tools": {
+                tool: {"version": e.version, "age_sec": int(now - e.checked_at), "derived": sorted(e.derived)}
+                for tool, e in self._entries.items()
+            },
+        }
+
+
+_cache: Optional[ToolCache] = None
+
+
+def get_tool_cache(config: Settings = settings) -> ToolCache:
+    """Process-wide tool cache (created on first use)."""
+    global _cache
+    if _cache is None:
+        _cache = ToolCache(config.tool_cache_ttls, default_ttl=config.tool_cache_default_ttl)
+    return _cache
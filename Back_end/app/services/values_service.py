@@ -5,18 +5,23 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from app.services.mcp_client import get_mcp_client
+from app.services.tool_cache import get_tool_cache
+
 logger = logging.getLogger(__name__)
 
 
 class ValuesService:
-    MCP_SERVER_URL = "http://localhost:8001"
-
     async def get_values_info(self) -> Optional[Dict[str, Any]]:
-        url = f"{self.MCP_SERVER_URL}/scrape/values"
+        """Return the values payload, served from the backend tool cache when still valid."""
+        return await get_tool_cache().get("values", self._fetch_values)
+
+    async def _fetch_values(self) -> Optional[Dict[str, Any]]:
+        mcp = get_mcp_client()
+        url = mcp.tool_url("values")
         logger.info("Calling MCP Server at %s for values data...", url)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url)
+            response = await mcp.post_tool("values")
 
             if response.status_code != 200:
                 logger.error(
@@ -0,0 +1,120 @@
+"""Precomputed spatial index over CAMPUSES for (batch) nearest-campus queries.
+
+Campuses are stored once as unit vectors on the sphere; the great-circle
+distance to a batch of points is then one matrix product and an arccos:
+
+    d = R * arccos(u_point . u_campus)
+
+For a few dozen campuses this beats any tree structure, and a batch of
+100k points is a (100k x N) product computed in milliseconds.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.campus_data import CAMPUSES
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def unit_vectors(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """(n, 3) unit vectors for latitudes/longitudes in degrees."""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+@dataclass(frozen=True)
+class NearestCampuses:
+    """Batch result: row i holds the k nearest campuses of point i, nearest first."""
+
+    cities: np.ndarray  # (n, k) campus names (object array)
+    distances_km: np.ndarray  # (n, k) float64
+
+    def row(self, i: int) -> List[Dict[str, Any]]:
+        return [
+            {"city": city, "dist_km": round(float(dist), 1)}
+            for city, dist in zip(self.cities[i], self.distances_km[i])
+            if city is not None
+        ]
+
+
+class CampusIndex:
+    """Unit vectors of every campus, grouped by country for per-country queries."""
+
+    def __init__(self, campuses: Mapping[str, Mapping[str, Any]] = CAMPUSES):
+        self.campuses = campuses
+        self.names = np.array(list(campuses), dtype=object)
+        self.countries = np.array([c["country"] for c in campuses.values()], dtype=object)
+        coords = np.array([c["coords"] for c in campuses.values()], dtype=np.float64)
+        self._vectors = unit_vectors(coords[:, 0], coords[:, 1])
+        self._by_country = {country: np.flatnonzero(self.countries == country) for country in dict.fromkeys(self.countries)}
+
+    def distances(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """(n, campuses) great-circle distances in km."""
+        dots = unit_vectors(lats, lons) @ self._vectors.T
+        return EARTH_RADIUS_KM * np.arccos(np.clip(dots, -1.0, 1.0))
+
+    @staticmethod
+    def _k_smallest(dist: np.ndarray, k: int) -> np.ndarray:
+        # argpartition then sort only the k kept columns (full argsort when k covers everything)
+        k = min(k, dist.shape[1])
+        if k < dist.shape[1]:
+            idx = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.broadcast_to(np.arange(dist.shape[1]), dist.shape)
+        order = np.take_along_axis(dist, idx, axis=1).argsort(axis=1, kind="stable")
+        return np.take_along_axis(idx, order, axis=1)
+
+    def nearest(self, lats: Sequence[float], lons: Sequence[float], k: int = 1) -> NearestCampuses:
+        """k nearest campuses overall for each point."""
+        return self._nearest(self.distances(lats, lons), k)
+
+    def nearest_in_country(
+        self, lats: Sequence[float], lons: Sequence[float], countries: Sequence[Optional[str]], k: int = 1
+    ) -> NearestCampuses:
+        """
+        k nearest campuses located in each point's own country.
+        Rows whose country has no campus (or is None/"Autre") are left empty.
+        """
+        return self._nearest_in_country(self.distances(lats, lons), countries, k)
+
+    def search(
+        self, lats: Sequence[float], lons: Sequence[float], countries: Sequence[Optional[str]], k: int = 1
+    ) -> Tuple[NearestCampuses, NearestCampuses]:
+        """(nearest overall, nearest in country) from a single distance computation."""
+        dist = self.distances(lats, lons)
+        return self._nearest(dist, k), self._nearest_in_country(dist, countries, k)
+
+    def _nearest(self, dist: np.ndarray, k: int) -> NearestCampuses:
+        idx = self._k_smallest(dist, k)
+        return NearestCampuses(self.names[idx], np.take_along_axis(dist, idx, axis=1))
+
+    def _nearest_in_country(self, dist: np.ndarray, countries: Sequence[Optional[str]], k: int) -> NearestCampuses:
+        n = dist.shape[0]
+        cities = np.full((n, k), None, dtype=object)
+        dists = np.full((n, k), np.nan)
+        countries = np.asarray(countries, dtype=object)
+        for country, cols in self._by_country.items():
+            rows = np.flatnonzero(countries == country)
+            if rows.size == 0:
+                continue
+            sub = dist[np.ix_(rows, cols)]
+            idx = self._k_smallest(sub, k)
+            cities[rows, : idx.shape[1]] = self.names[cols][idx]
+            dists[rows, : idx.shape[1]] = np.take_along_axis(sub, idx, axis=1)
+        return NearestCampuses(cities, dists)
+
+
+_index: Optional[CampusIndex] = None
+
+
+def get_campus_index() -> CampusIndex:
+    """Process-wide index over CAMPUSES (built on first use)."""
+    global _index
+    if _index is None:
+        _index = CampusIndex()
+    return _index
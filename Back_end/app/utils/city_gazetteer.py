@@ -0,0 +1,129 @@
+"""Offline gazetteer of populated places (city name -> country + coordinates).
+
+Data: app/data/cities.tsv.gz, built by scripts/build_city_gazetteer.py from
+GeoNames (CC BY 4.0). One line per place:
+
+    name  country_code  lat  lon  population  alias|alias|...
+
+Aliases are already normalized (see `normalize_place`): exonyms such as
+"cologne" for Köln or "barcelone" for Barcelona. The file is read on first use
+into a sorted key array; exact lookups are binary searches over it.
+"""
+
+import bisect
+import gzip
+import logging
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cities.tsv.gz")
+
+_SEPARATORS_RE = re.compile(r"[-'’‘.,_/]")
+
+
+def normalize_place(name: str) -> str:
+    """Accent-folded, case-folded, punctuation as spaces: "Saint-Étienne" -> "saint etienne", "Köln" -> "koln"."""
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(c for c in s if not unicodedata.combining(c)).casefold()
+    return " ".join(_SEPARATORS_RE.sub(" ", s).split())
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    country_code: str
+    lat: float
+    lon: float
+    population: int
+
+
+class CityGazetteer:
+    """Place index loaded on first use (or at startup); missing file = every name is unknown."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._places: List[Place] = []
+        # Parallel arrays sorted by (key, alias?, not French?, -population): key -> index into _places
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def load(self) -> None:
+        """Read the file now (the app lifespan does it in a thread, so no request pays for it)."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                logger.info("City gazetteer not found at %s; city names will be geocoded online", self.path)
+                return
+            index = []
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        if line.startswith("#"):
+                            continue
+                        name, cc, lat, lon, population, aliases = line.rstrip("\n").split("\t")
+                        place = Place(name, cc, float(lat), float(lon), int(population))
+                        i = len(self._places)
+                        self._places.append(place)
+                        own = normalize_place(name)
+                        # Homonyms: French places first, then by population ("Orange" is Orange (FR),
+                        # not Orange, California; "Saint-Denis" is the one near Paris, not Réunion's)
+                        foreign = cc != "FR"
+                        index.append((own, 0, foreign, -place.population, i))
+                        # Aliases rank after real names: "Valence" is Valence (FR), not Valencia's exonym
+                        index.extend(
+                            (a, 1, foreign, -place.population, i) for a in aliases.split("|") if a and a != own
+                        )
+            except (OSError, ValueError) as e:
+                logger.warning("Unreadable city gazetteer %s: %s", self.path, e)
+                self._places = []
+                return
+            index.sort()
+            self._keys = [entry[0] for entry in index]
+            self._ids = [entry[-1] for entry in index]
+            logger.info("City gazetteer loaded: %d places, %d names", len(self._places), len(self._keys))
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Place whose name (else alias) matches exactly after normalization: French first, then most populous."""
+        if not self._loaded:
+            self.load()
+        key = normalize_place(name)
+        i = bisect.bisect_left(self._keys, key)
+        if key and i < len(self._keys) and self._keys[i] == key:
+            self.stats["hits"] += 1
+            return self._places[self._ids[i]]
+        self.stats["misses"] += 1
+        return None
+
+    def match_leading(self, text: str) -> Optional[Place]:
+        """Place named by the longest run of leading words: "Lyon 3e arrondissement" -> Lyon."""
+        words = normalize_place(text).split()
+        for n in range(len(words), 0, -1):
+            place = self.lookup(" ".join(words[:n]))
+            if place is not None:
+                return place
+        return None
+
+    def snapshot(self) -> Dict[str, object]:
+        return {**self.stats, "loaded": bool(self._places), "places": len(self._places)}
+
+
+_gazetteer: Optional[CityGazetteer] = None
+
+
+def get_city_gazetteer(path: Optional[str] = None) -> CityGazetteer:
+    """Process-wide gazetteer (the file is only read on the first lookup)."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = CityGazetteer(path or DEFAULT_PATH)
+    return _gazetteer
@@ -28,3 +28,20 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     
     return R * c
+
+
+# ISO 3166-1 alpha-2 -> country name as used in CAMPUSES / prompts (French).
+# Overseas departments count as France (nearest campus in the same country).
+COUNTRY_NAMES = {
+    "FR": "France", "RE": "France", "GP": "France", "MQ": "France", "GF": "France", "YT": "France",
+    "ES": "Espagne", "DE": "Allemagne", "BE": "Belgique", "BJ": "Benin",
+    "CH": "Suisse", "LU": "Luxembourg", "MC": "Monaco", "IT": "Italie", "PT": "Portugal",
+    "NL": "Pays-Bas", "GB": "Royaume-Uni", "IE": "Irlande", "AT": "Autriche", "PL": "Pologne",
+    "US": "États-Unis", "CA": "Canada", "MA": "Maroc", "DZ": "Algérie", "TN": "Tunisie",
+    "SN": "Sénégal", "CI": "Côte d'Ivoire", "CM": "Cameroun", "TG": "Togo", "MU": "Maurice",
+}
+
+
+def country_name(country_code: str) -> str:
+    """Country name for an ISO alpha-2 code ("Autre" when unknown, like the previous text matching)."""
+    return COUNTRY_NAMES.get((country_code or "").upper(), "Autre")
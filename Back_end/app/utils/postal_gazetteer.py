@@ -0,0 +1,130 @@
+"""Offline French postal-code gazetteer (postal code -> centroid + label).
+
+The table is a compact binary file, memory-mapped on first use:
+
+    header   magic b"EPQZ", version u16, pad u16, count u32, labels_size u32
+    codes    count x u32    postal codes as integers, sorted ascending
+    lats     count x f32
+    lons     count x f32
+    offsets  (count + 1) x u32   label i is labels[offsets[i]:offsets[i + 1]]
+    labels   utf-8 blob
+
+A lookup is a binary search over the mapped `codes` array (a few microseconds,
+no parsing at startup). The bundled file is produced by scripts/build_postal_gazetteer.py
+from GeoNames data (CC BY 4.0); the La Poste "base officielle des codes postaux" works too.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EPQZ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "fr_postal_codes.bin")
+
+
+def write_gazetteer(path: str, entries: List[Tuple[int, float, float, str]]) -> None:
+    """Write (code, lat, lon, label) entries in the binary format (entries are sorted here)."""
+    entries = sorted(entries)
+    labels = [label.encode("utf-8") for _code, _lat, _lon, label in entries]
+    offsets = [0]
+    for raw in labels:
+        offsets.append(offsets[-1] + len(raw))
+    blob = b"".join(labels)
+    n = len(entries)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, n, len(blob)))
+        f.write(struct.pack(f"<{n}I", *(e[0] for e in entries)))
+        f.write(struct.pack(f"<{n}f", *(e[1] for e in entries)))
+        f.write(struct.pack(f"<{n}f", *(e[2] for e in entries)))
+        f.write(struct.pack(f"<{n + 1}I", *offsets))
+        f.write(blob)
+
+
+class PostalGazetteer:
+    """Lazily memory-mapped postal-code table; missing file = every code is unknown."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._mm: Optional[mmap.mmap] = None
+        self._codes: Optional[memoryview] = None
+        self._lats: Optional[memoryview] = None
+        self._lons: Optional[memoryview] = None
+        self._offsets: Optional[memoryview] = None
+        self._labels_at = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def load(self) -> None:
+        """Map the file now (the app lifespan does it, so /health reports it from startup)."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                logger.info("Postal gazetteer not found at %s; zip codes will be geocoded online", self.path)
+                return
+            try:
+                with open(self.path, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, _pad, n, _labels_size = HEADER.unpack_from(mm, 0)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"unexpected header {magic!r} v{version}")
+                view = memoryview(mm)
+                at = HEADER.size
+                self._codes = view[at : at + 4 * n].cast("I")
+                at += 4 * n
+                self._lats = view[at : at + 4 * n].cast("f")
+                at += 4 * n
+                self._lons = view[at : at + 4 * n].cast("f")
+                at += 4 * n
+                self._offsets = view[at : at + 4 * (n + 1)].cast("I")
+                self._labels_at = at + 4 * (n + 1)
+                self._mm = mm
+                logger.info("Postal gazetteer loaded: %d codes", n)
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning("Unreadable postal gazetteer %s: %s", self.path, e)
+                self._codes = None
+
+    def lookup(self, postal_code: str) -> Optional[Tuple[float, float, str]]:
+        """(lat, lon, label) for a 5-digit French postal code, or None if unknown."""
+        if not self._loaded:
+            self.load()
+        code = postal_code.strip()
+        if self._codes is None or len(code) != 5 or not code.isdigit():
+            self.stats["misses"] += 1
+            return None
+        key = int(code)
+        i = bisect.bisect_left(self._codes, key)
+        if i == len(self._codes) or self._codes[i] != key:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        start = self._labels_at + self._offsets[i]
+        end = self._labels_at + self._offsets[i + 1]
+        label = bytes(self._mm[start:end]).decode("utf-8")
+        # float32 storage: ~1 m precision, rounded to drop the float noise
+        return round(self._lats[i], 5), round(self._lons[i], 5), label
+
+    def snapshot(self) -> Dict[str, object]:
+        return {**self.stats, "loaded": self._codes is not None, "codes": len(self._codes) if self._codes is not None else 0}
+
+
+_gazetteer: Optional[PostalGazetteer] = None
+
+
+def get_postal_gazetteer(path: Optional[str] = None) -> PostalGazetteer:
+    """Process-wide gazetteer (the file is mapped by `load()` or the first lookup)."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = PostalGazetteer(path or DEFAULT_PATH)
+    return _gazetteer
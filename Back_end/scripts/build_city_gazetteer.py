@@ -0,0 +1,104 @@
+"""
+Build app/data/cities.tsv.gz (offline city gazetteer) from GeoNames data (CC BY 4.0).
+
+Accepted sources (several can be given, places are merged by geonameid):
+  - GeoNames dumps: cities15000.txt, cities1000.txt, ... from https://download.geonames.org/export/dump/
+  - the same data as JSON, as shipped by the `geonamescache` package (data/citiesN.json)
+
+Selection: every place with population >= --min-population, plus places of
+--local-countries with population >= --local-min-population (small French and
+Belgian towns are common inputs here). Exonyms/aliases are kept only for places
+with population >= --alias-min-population, Latin-script proper names only,
+to keep the file small.
+
+Usage (from Back_end/):
+  python scripts/build_city_gazetteer.py cities15000.txt cities1000.txt [-o app/data/cities.tsv.gz]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.city_gazetteer import DEFAULT_PATH, normalize_place  # noqa: E402
+
+_ALIAS_RE = re.compile(r"^[a-z ]{3,30}$")
+
+
+def _read_dump(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 15:
+                continue
+            yield {
+                "geonameid": int(cols[0]),
+                "name": cols[1],
+                "alternatenames": [a for a in cols[3].split(",") if a],
+                "latitude": float(cols[4]),
+                "longitude": float(cols[5]),
+                "countrycode": cols[8],
+                "population": int(cols[14] or 0),
+            }
+
+
+def _read_json(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        yield from json.load(f).values()
+
+
+def _aliases(place: Dict[str, Any]) -> str:
+    base = normalize_place(place["name"])
+    out = set()
+    for alt in place.get("alternatenames") or []:
+        # Latin-script proper names only ("Cologne", "Barcelone"), not codes ("CGN") or romanizations
+        if not alt[:1].isupper() or alt.isupper():
+            continue
+        key = normalize_place(alt)
+        if _ALIAS_RE.match(key) and key != base:
+            out.add(key)
+    return "|".join(sorted(out))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="GeoNames citiesN.txt dumps or geonamescache citiesN.json")
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH)
+    parser.add_argument("--min-population", type=int, default=15000)
+    parser.add_argument("--local-countries", default="FR,BE,CH,LU,MC,RE,GP,MQ,GF,YT")
+    parser.add_argument("--local-min-population", type=int, default=1000)
+    parser.add_argument("--alias-min-population", type=int, default=250000)
+    args = parser.parse_args()
+
+    local = set(args.local_countries.split(","))
+    places: Dict[int, Dict[str, Any]] = {}
+    for source in args.sources:
+        rows = _read_json(source) if source.endswith(".json") else _read_dump(source)
+        for p in rows:
+            floor = args.local_min_population if p["countrycode"] in local else args.min_population
+            if p["population"] >= floor:
+                places[p["geonameid"]] = p
+    if not places:
+        sys.exit("No place selected")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with gzip.open(args.output, "wt", encoding="utf-8", compresslevel=9) as f:
+        f.write("# name\tcountry\tlat\tlon\tpopulation\taliases -- GeoNames (CC BY 4.0), geonames.org\n")
+        for p in sorted(places.values(), key=lambda p: (p["countrycode"], -p["population"], p["name"])):
+            aliases = _aliases(p) if p["population"] >= args.alias_min_population else ""
+            f.write(
+                f"{p['name']}\t{p['countrycode']}\t{p['latitude']:.4f}\t{p['longitude']:.4f}\t"
+                f"{p['population']}\t{aliases}\n"
+            )
+    print(f"{len(places)} places -> {args.output} ({os.path.getsize(args.output) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
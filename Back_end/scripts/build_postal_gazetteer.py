@@ -0,0 +1,185 @@
+"""
+Build app/data/fr_postal_codes.bin (offline postal-code gazetteer) from open data.
+
+Accepted inputs (format detected from the first line):
+  - GeoNames postal export for France: FR.txt from https://download.geonames.org/export/zip/FR.zip
+    (tab-separated: country, postal code, place name, admin..., latitude, longitude, accuracy)
+  - the same export as CSV without coordinates (header "postal_code,country_code,admin_name1,
+    admin_code1,...,place_name", e.g. FR.zcsv in the `pyworldzipcode` package): coordinates are
+    then taken from GeoNames places given with --places (commune name + region code)
+  - La Poste "base officielle des codes postaux" CSV (datanova.laposte.fr, `;`-separated,
+    with a `coordonnees_gps` column "lat, lon")
+
+Several places can share one postal code: the entry keeps the mean of their
+coordinates and a label with the first place names ("01400 Châtillon-sur-Chalaronne, ...").
+When coordinates come from --places, communes found far from the rest of their
+departement (a namesake elsewhere in the region) are dropped. Codes none of whose
+places could be located are left out (they are geocoded online).
+
+Usage (from Back_end/):
+  python scripts/build_postal_gazetteer.py FR.txt [-o app/data/fr_postal_codes.bin]
+  python scripts/build_postal_gazetteer.py FR.zcsv --places cities500.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import statistics
+import sys
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.city_gazetteer import normalize_place  # noqa: E402
+from app.utils.postal_gazetteer import DEFAULT_PATH, write_gazetteer  # noqa: E402
+
+MAX_NAMES_IN_LABEL = 3
+# a located commune this far from the other communes of its departement is a namesake
+MAX_KM_FROM_DEPARTEMENT = 100.0
+
+# "Paris 11", "Lyon 03", "Marseille Cedex 20" -> the commune name
+_DISTRICT_RE = re.compile(r"\s+(\d+|cedex.*)$", re.IGNORECASE)
+
+# (postal code, place name, admin1 code, lat, lon); lat/lon are None when the source has no coordinates
+Row = Tuple[str, str, str, Optional[float], Optional[float]]
+
+
+def _geonames_rows(path: str) -> Iterator[Row]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 11 or not cols[9] or not cols[10]:
+                continue
+            yield cols[1], cols[2], cols[4], float(cols[9]), float(cols[10])
+
+
+def _geonames_csv_rows(path: str) -> Iterator[Row]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            yield row["postal_code"], row["place_name"], row.get("admin_code1") or "", None, None
+
+
+def _laposte_rows(path: str) -> Iterator[Row]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        for row in reader:
+            gps = (row.get("coordonnees_gps") or row.get("coordonnees_geographiques") or "").split(",")
+            code = row.get("Code_postal") or row.get("code_postal") or ""
+            name = row.get("Nom_de_la_commune") or row.get("nom_de_la_commune") or ""
+            if len(gps) != 2 or not code:
+                continue
+            yield code.zfill(5), name.title(), "", float(gps[0]), float(gps[1])
+
+
+def read_rows(path: str) -> Iterator[Row]:
+    with open(path, encoding="utf-8-sig") as f:
+        first = f.readline()
+    if "\t" in first:
+        return _geonames_rows(path)
+    if first.startswith("postal_code,"):
+        return _geonames_csv_rows(path)
+    return _laposte_rows(path)
+
+
+def read_places(paths: List[str], country: str = "FR") -> Dict[Tuple[str, str], List[Tuple[float, float]]]:
+    """(normalized name, admin1 code) -> coordinates of the GeoNames places of `country` with that name."""
+    places: Dict[Tuple[str, str], List[Tuple[float, float]]] = defaultdict(list)
+    for path in paths:
+        if path.endswith(".json"):  # geonamescache data/citiesN.json
+            with open(path, encoding="utf-8") as f:
+                rows = [
+                    (p["countrycode"], p["name"], p["admin1code"], p["latitude"], p["longitude"])
+                    for p in json.load(f).values()
+                ]
+        else:  # GeoNames dump citiesN.txt
+            with open(path, encoding="utf-8") as f:
+                rows = [
+                    (cols[8], cols[1], cols[10], float(cols[4]), float(cols[5]))
+                    for cols in (line.rstrip("\n").split("\t") for line in f)
+                    if len(cols) >= 11
+                ]
+        for cc, name, admin1, lat, lon in rows:
+            if cc == country:
+                places[(normalize_place(name), admin1)].append((lat, lon))
+    return places
+
+
+def locate(rows: Iterator[Row], places: Dict[Tuple[str, str], List[Tuple[float, float]]]) -> Iterator[Row]:
+    """Fill missing coordinates from `places`; rows with no unambiguous match are dropped."""
+    for code, name, admin1, lat, lon in rows:
+        if lat is None or lon is None:
+            for candidate in (name, _DISTRICT_RE.sub("", name)):
+                found = places.get((normalize_place(candidate), admin1), [])
+                if found:
+                    break
+            # several communes with that name in the region: no way to tell which one
+            if len(found) != 1:
+                continue
+            lat, lon = found[0]
+        yield code, name, admin1, lat, lon
+
+
+def _departement(code: str) -> str:
+    return code[:3] if code.startswith(("97", "98")) else code[:2]
+
+
+def drop_strays(rows: Iterator[Row]) -> Iterator[Row]:
+    """Drop rows far from the median position of their departement (first digits of the code)."""
+    by_dep: Dict[str, List[Row]] = defaultdict(list)
+    for row in rows:
+        if row[3] is not None and row[4] is not None:
+            by_dep[_departement(row[0])].append(row)
+    for dep_rows in by_dep.values():
+        mid_lat = statistics.median(r[3] for r in dep_rows)
+        mid_lon = statistics.median(r[4] for r in dep_rows)
+        scale = math.cos(math.radians(mid_lat))
+        for row in dep_rows:
+            if 111.2 * math.hypot(row[3] - mid_lat, (row[4] - mid_lon) * scale) <= MAX_KM_FROM_DEPARTEMENT:
+                yield row
+
+
+def build_entries(rows: Iterator[Row]) -> List[Tuple[int, float, float, str]]:
+    places: Dict[str, List[Tuple[str, float, float]]] = defaultdict(list)
+    for code, name, _admin1, lat, lon in rows:
+        if len(code) == 5 and code.isdigit() and lat is not None and lon is not None:
+            places[code].append((name, lat, lon))
+
+    entries = []
+    for code, items in places.items():
+        lat = sum(i[1] for i in items) / len(items)
+        lon = sum(i[2] for i in items) / len(items)
+        names = list(dict.fromkeys(i[0] for i in items if i[0]))
+        label = ", ".join(names[:MAX_NAMES_IN_LABEL]) + (", ..." if len(names) > MAX_NAMES_IN_LABEL else "")
+        entries.append((int(code), lat, lon, f"{code} {label}".strip()))
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="GeoNames FR.txt (or its CSV without coordinates) or La Poste CSV")
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH)
+    parser.add_argument(
+        "--places", nargs="+", default=[],
+        help="GeoNames citiesN.txt dumps or geonamescache citiesN.json, to locate rows without coordinates",
+    )
+    args = parser.parse_args()
+
+    rows = read_rows(args.source)
+    if args.places:
+        rows = drop_strays(locate(rows, read_places(args.places)))
+    entries = build_entries(rows)
+    if not entries:
+        sys.exit(f"No postal code found in {args.source}")
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_gazetteer(args.output, entries)
+    print(f"{len(entries)} postal codes -> {args.output} ({os.path.getsize(args.output) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
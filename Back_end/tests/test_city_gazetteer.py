@@ -0,0 +1,33 @@
+"""Offline city gazetteer: French homonyms win, and the nearest campus follows."""
+
+import asyncio
+
+from app.services.geocoding_service import GeocodingService
+from app.utils.city_gazetteer import get_city_gazetteer
+
+
+def test_orange_is_the_french_town():
+    place = get_city_gazetteer().lookup("Orange")
+    assert place.country_code == "FR"
+    assert abs(place.lat - 44.14) < 0.1 and abs(place.lon - 4.81) < 0.1
+
+
+def test_saint_denis_is_near_paris_not_reunion():
+    place = get_city_gazetteer().lookup("Saint-Denis")
+    assert place.country_code == "FR"
+    assert abs(place.lat - 48.94) < 0.1 and abs(place.lon - 2.36) < 0.1
+
+
+def test_foreign_city_without_french_homonym_still_resolves():
+    assert get_city_gazetteer().lookup("Barcelone").country_code == "ES"
+
+
+def test_nearest_campus_for_french_homonyms():
+    async def nearest(query):
+        return await GeocodingService.get_nearest_campus(query)
+
+    # Orange, California used to give Rennes at 8924 km; Saint-Denis (Réunion) Cotonou at 6531 km
+    for query in ("Orange", "Saint-Denis"):
+        overall, _in_country, detected = asyncio.run(nearest(query))
+        assert "France" in detected
+        assert overall["dist"] < 150
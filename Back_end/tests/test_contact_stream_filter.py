@@ -0,0 +1,54 @@
+"""ContactStreamFilter: progressive release without ever sending contact details."""
+
+from app.services.chat_service import ChatService, ContactStreamFilter
+
+
+def _stream(chunks):
+    f = ContactStreamFilter(ChatService._is_contact_like_line)
+    deltas = [f.feed(c) for c in chunks]
+    return deltas, f.flush(), f.removed_any
+
+
+def _tokens(text):
+    # Ollama-like chunks: a word and its leading space
+    out, word = [], ""
+    for c in text:
+        if c == " " and word:
+            out.append(word)
+            word = ""
+        word += c
+    return out + [word]
+
+
+def test_single_paragraph_is_released_progressively():
+    text = "Epitech forme des experts en informatique. Les cours commencent en septembre."
+    deltas, tail, removed = _stream(_tokens(text))
+    assert "".join(deltas) + tail == text
+    assert not removed
+    # first words are out long before the end of the paragraph
+    first = next(i for i, d in enumerate(deltas) if d)
+    assert first <= 2
+
+
+def test_phone_number_is_never_sent():
+    text = "Pour nous joindre appelez le 01 44 08 00 60 ou venez sur place.\nBonne journée !"
+    deltas, tail, removed = _stream(_tokens(text))
+    sent = "".join(deltas) + tail
+    assert removed
+    assert "01" not in sent and "44 08" not in sent
+    assert sent.endswith("\nBonne journée !")
+
+
+def test_email_and_keyword_lines_are_dropped():
+    text = "Infos utiles :\nEmail : contact@epitech.eu\nÀ bientôt"
+    deltas, tail, removed = _stream(_tokens(text))
+    sent = "".join(deltas) + tail
+    assert removed
+    assert "@" not in sent and "Email" not in sent
+    assert sent == "Infos utiles :\nÀ bientôt"
+
+
+def test_numbers_are_released_once_they_cannot_be_a_phone_number():
+    deltas, tail, removed = _stream(_tokens("Il y a 16 campus en France."))
+    assert "".join(deltas) + tail == "Il y a 16 campus en France."
+    assert not removed
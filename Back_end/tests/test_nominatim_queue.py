@@ -0,0 +1,64 @@
+"""NominatimQueue: cancelled callers neither poison coalesced requests nor burn rate-limit slots."""
+
+import asyncio
+
+from app.services.nominatim_queue import NominatimQueue
+
+
+class _Response:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return [{"lat": "40.4", "lon": "-3.7"}]
+
+
+class _Client:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def get(self, *_args, **_kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return _Response()
+
+
+def _queue(client, rate):
+    queue = NominatimQueue()
+    queue._client = client
+    queue._bucket.rate = rate
+    queue.max_wait_sec = 10.0
+    return queue
+
+
+def test_caller_arriving_after_last_waiter_left_gets_a_fresh_request():
+    async def scenario():
+        queue = _queue(_Client(delay=0.1), rate=1000.0)
+        first = asyncio.create_task(queue.search("Madrid"))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        second = asyncio.create_task(queue.search("Madrid"))
+        return await second
+
+    assert asyncio.run(scenario()) == [{"lat": "40.4", "lon": "-3.7"}]
+
+
+def test_cancelled_waiter_refunds_its_slot():
+    async def scenario():
+        client = _Client()
+        queue = _queue(client, rate=5.0)  # one slot every 0.2 s
+        await queue.search("Paris")  # uses the burst token
+        loser = asyncio.create_task(queue.search("Lyon"))  # books the next slot
+        await asyncio.sleep(0.02)
+        loser.cancel()
+        await asyncio.gather(loser, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await queue.search("Nantes")
+        return loop.time() - start, client.calls, queue.stats["refunded"]
+
+    waited, calls, refunded = asyncio.run(scenario())
+    assert refunded == 1
+    assert calls == 2  # the cancelled lookup never reached Nominatim
+    assert waited < 0.3  # one slot, not two (0.4 s) behind the cancelled reservation
@@ -0,0 +1,86 @@
+"""ToolCache single flight: concurrent callers on a cold cache share one fetch."""
+
+import asyncio
+import time
+
+from app.services.tool_cache import ToolCache
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_cold_cache_failing_fetch_is_shared():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)  # MCP hanging until the client timeout
+        return None  # the MCP client gives up: failure
+
+    async def scenario():
+        cache = ToolCache({"cold_fail": 300.0})
+        start = time.perf_counter()
+        results = await asyncio.gather(*(cache.get("cold_fail", fetch) for _ in range(3)))
+        return results, time.perf_counter() - start, cache.stats
+
+    results, elapsed, stats = _run(scenario())
+    assert results == [None, None, None]
+    assert calls == 1
+    assert elapsed < 0.35  # one timeout, not one per waiter
+    assert stats["joined"] == 2
+
+
+def test_cold_cache_fetch_error_reaches_every_waiter():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise RuntimeError("MCP down")
+
+    async def scenario():
+        cache = ToolCache({"cold_error": 300.0})
+        return await asyncio.gather(*(cache.get("cold_error", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = _run(scenario())
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cold_cache_success_is_shared_and_cached():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"data": [1], "meta": {"snapshot_version": 1}}
+
+    async def scenario():
+        cache = ToolCache({"cold_ok": 300.0})
+        first = await asyncio.gather(*(cache.get("cold_ok", fetch) for _ in range(3)))
+        again = await cache.get("cold_ok", fetch)
+        return first, again
+
+    first, again = _run(scenario())
+    assert calls == 1
+    assert first[0] is first[1] is first[2] is again
+
+
+def test_waiter_leaving_does_not_cancel_the_flight():
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return {"data": [1], "meta": {}}
+
+    async def scenario():
+        cache = ToolCache({"cold_cancel": 300.0})
+        first = asyncio.create_task(cache.get("cold_cancel", fetch))
+        second = asyncio.create_task(cache.get("cold_cancel", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert _run(scenario()) == {"data": [1], "meta": {}}
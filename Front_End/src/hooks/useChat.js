@@ -1,5 +1,5 @@
 import { useState, useRef, useEffect } from 'react';
-import { sendMessage } from '../services/api';
+import { streamMessage } from '../services/api';
 import { CAMPUSES } from '../services/constants';
 
 export const useChat = () => {
@@ -61,11 +61,33 @@ export const useChat = () => {
         setInput('');
         setIsLoading(true);
 
+        // Streamed answer: the bot message is added on the first chunk and grows in place
+        const botId = Date.now() + 1;
+        let started = false;
+
         try {
-            const response = await sendMessage(textToSend, historyForBackend);
-            const botMessage = { ...response, id: Date.now() + 1 };
-            setMessages(prev => [...prev, botMessage]);
+            const response = await streamMessage(textToSend, historyForBackend, {
+                onDelta: (_chunk, fullText) => {
+                    if (!started) {
+                        started = true;
+                        setMessages(prev => [...prev, { id: botId, text: fullText, sender: 'bot' }]);
+                    } else {
+                        setMessages(prev => prev.map(msg => msg.id === botId ? { ...msg, text: fullText } : msg));
+                    }
+                }
+            });
+            const botMessage = { ...response, id: botId };
+            setMessages(prev => started
+                ? prev.map(msg => msg.id === botId ? botMessage : msg)
+                : [...prev, botMessage]);
         } catch (error) {
+            if (started) {
+                // Connection lost mid-answer: keep what was received
+                setMessages(prev => prev.map(msg => msg.id === botId
+                    ? { ...msg, text: `${msg.text}\n\n⚠️ *Réponse interrompue.*`, isError: true }
+                    : msg));
+                return;
+            }
             setMessages(prev => [...prev, {
                 id: Date.now() + 1,
                 text: "⚠️ **Connexion au Cerveau Impossible** \n\n Je n'arrive pas à joindre le serveur. \n\n Pour vous aider, je peux chercher votre campus Epitech le plus proche. \n\n **Quel est votre Code Postal ?**",
@@ -27,3 +27,79 @@ export const sendMessage = async (text, history = []) => {
         throw error;
     }
 };
+
+// SSE endpoint (POST /chat/stream): same request body, answer streamed as events
+const STREAM_URL = import.meta.env.VITE_API_STREAM_URL || `${API_URL.replace(/\/$/, '')}/stream`;
+
+const parseEvent = (raw) => {
+    let event = 'message';
+    const dataLines = [];
+    for (const line of raw.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+    }
+    return { event, data: dataLines.length ? JSON.parse(dataLines.join('\n')) : {} };
+};
+
+/**
+ * Stream a bot answer from POST /chat/stream.
+ * onMeta(meta) is called once tools ran, onDelta(chunk, fullText) for every text chunk.
+ * Resolves with the full message once the `done` event arrives; rejects on HTTP or `error` events.
+ */
+export const streamMessage = async (text, history = [], { onMeta, onDelta } = {}) => {
+    const response = await fetch(STREAM_URL, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+        },
+        body: JSON.stringify({
+            message: text,
+            history: history
+        }),
+    });
+
+    if (!response.ok || !response.body) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    let fullText = '';
+    let meta = null;
+    let stats = null;
+
+    for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value.replace(/\r\n/g, '\n');
+
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const { event, data } = parseEvent(buffer.slice(0, sep));
+            buffer = buffer.slice(sep + 2);
+
+            if (event === 'meta') {
+                meta = data;
+                onMeta?.(data);
+            } else if (event === 'delta') {
+                fullText += data.text || '';
+                onDelta?.(data.text || '', fullText);
+            } else if (event === 'done') {
+                stats = data;
+            } else if (event === 'error') {
+                throw new Error(data.detail || 'Stream error');
+            }
+        }
+    }
+
+    if (!stats) {
+        throw new Error('Stream ended before completion');
+    }
+    return {
+        text: fullText || "Réponse reçue du backend.",
+        sender: 'bot',
+        backendSource: meta?.backend_source,
+        stats
+    };
+};
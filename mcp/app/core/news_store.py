@@ -0,0 +1,123 @@
+"""Append-only SQLite store for news items, plus the ingestion cursor.
+
+Articles are inserted once (keyed by link) and never rewritten; the `news`
+tool payload is simply the newest rows. The cursor remembers which feed or
+sitemap is used as the source and the publication time of the newest item
+already ingested, so a refresh only looks at entries newer than that.
+Lives in the same SQLite file as the snapshots.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set
+
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS news_items (
+        link TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        date TEXT,
+        published_at REAL NOT NULL,
+        source TEXT NOT NULL,
+        added_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS news_items_published ON news_items (published_at DESC)",
+    """
+    CREATE TABLE IF NOT EXISTS news_cursor (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        source_url TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        cursor REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+]
+
+
+@dataclass(frozen=True)
+class NewsCursor:
+    # Feed or sitemap the items come from, and its format (rss, atom, sitemap, sitemapindex)
+    source_url: str
+    kind: str
+    # Publication timestamp of the newest ingested item (0 = nothing yet)
+    cursor: float
+
+
+class NewsStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Short-lived connections: calls come from worker threads (asyncio.to_thread).
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def append(self, items: List[Dict[str, Any]], source: str) -> int:
+        """Insert items not seen yet (existing links are left untouched). Returns the number added."""
+        now = time.time()
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO news_items (link, title, summary, date, published_at, source, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        item["link"],
+                        item.get("title") or "Sans titre",
+                        item.get("summary") or "",
+                        item.get("date"),
+                        item.get("published_at") or now,
+                        source,
+                        now,
+                    )
+                    for item in items
+                ],
+            )
+            return conn.total_changes - before
+
+    def known(self, links: List[str]) -> Set[str]:
+        """Subset of `links` already stored."""
+        if not links:
+            return set()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT link FROM news_items WHERE link IN ({','.join('?' * len(links))})", links
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        """Newest items first, in the tool payload schema."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT title, summary, link, date FROM news_items "
+                "ORDER BY published_at DESC, added_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [{"title": title, "summary": summary, "link": link, "date": date} for title, summary, link, date in rows]
+
+    def get_cursor(self) -> NewsCursor | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT source_url, kind, cursor FROM news_cursor WHERE id = 1").fetchone()
+        return NewsCursor(*row) if row else None
+
+    def set_cursor(self, cursor: NewsCursor) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO news_cursor (id, source_url, kind, cursor, updated_at) VALUES (1, ?, ?, ?, ?)",
+                (cursor.source_url, cursor.kind, cursor.cursor, time.time()),
+            )
+
+    def clear_cursor(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM news_cursor")
@@ -0,0 +1,74 @@
+"""Per-record change tracking for scraper snapshots.
+
+Each tool splits its payload into keyed records (one per campus, one per
+degree page, ...). Records are hashed on every refresh; the tool version only
+moves when at least one record was added, changed or removed, and every record
+remembers the version it last changed in. That is enough to answer "what
+changed since version N" without keeping old payloads around.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# Splits a tool payload into {record_key: record}. Records must be JSON-serializable
+# and must not contain volatile fields (timings...), or every refresh would look like a change.
+RecordsFn = Callable[[Any], Dict[str, Any]]
+
+
+def whole_payload(data: Any) -> Dict[str, Any]:
+    """Default split for single-document tools: the payload is one record."""
+    return {"": data}
+
+
+def record_hash(record: Any) -> str:
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class RecordIndex:
+    hashes: Dict[str, str] = field(default_factory=dict)
+    # key -> tool version in which the record was last added or changed
+    versions: Dict[str, int] = field(default_factory=dict)
+    # key -> tool version in which the record disappeared (tombstones)
+    removed: Dict[str, int] = field(default_factory=dict)
+
+    def changed_since(self, since: int) -> Tuple[List[str], List[str]]:
+        """Returns (changed_keys, removed_keys) for versions strictly greater than `since`."""
+        changed = [k for k, v in self.versions.items() if v > since]
+        removed = [k for k, v in self.removed.items() if v > since]
+        return changed, removed
+
+    def to_json(self) -> str:
+        return json.dumps({"hashes": self.hashes, "versions": self.versions, "removed": self.removed})
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> "RecordIndex":
+        if not raw:
+            return cls()
+        d = json.loads(raw)
+        return cls(hashes=d.get("hashes", {}), versions=d.get("versions", {}), removed=d.get("removed", {}))
+
+
+def next_version(prev_version: int, prev: RecordIndex, records: Dict[str, Any]) -> Tuple[int, RecordIndex]:
+    """
+    Compare fresh records with the previous index.
+    Returns (version, index): the version is bumped only if something changed.
+    """
+    hashes = {key: record_hash(rec) for key, rec in records.items()}
+    if prev_version and hashes == prev.hashes:
+        return prev_version, prev
+
+    version = prev_version + 1
+    versions = {
+        key: prev.versions.get(key, version) if prev.hashes.get(key) == h else version
+        for key, h in hashes.items()
+    }
+    removed = {key: v for key, v in prev.removed.items() if key not in hashes}
+    removed.update({key: version for key in prev.hashes if key not in hashes})
+    return version, RecordIndex(hashes=hashes, versions=versions, removed=removed)
@@ -0,0 +1,206 @@
+"""Background refresh scheduler for scraper snapshots.
+
+Each tool is refreshed on its own cadence by a small pool of workers, so
+scraping load is driven by the clock instead of chat traffic. Jobs go through
+a priority queue with two lanes: a cache miss on a user's critical path
+(INTERACTIVE) always jumps ahead of periodic refreshes (BACKGROUND).
+
+Priority alone does not help when every worker is busy with a long background
+crawl (degrees, news): an interactive job that no idle worker can take right
+away bypasses the queue and runs at once, outside the pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Dict, List, Set, Tuple
+
+from app.core.snapshots import Loader, Snapshot, SnapshotCache
+
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_LANE_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# After a failed refresh, retry sooner than the normal cadence (but not in a tight loop).
+_RETRY_AFTER_SEC = 300.0
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        snapshots: SnapshotCache,
+        loaders: Dict[str, Loader],
+        intervals_sec: Dict[str, float],
+        workers: int = 2,
+    ) -> None:
+        self.snapshots = snapshots
+        self.loaders = loaders
+        self.intervals_sec = intervals_sec
+        self.workers = max(1, workers)
+
+        self._queue: asyncio.PriorityQueue[Tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        # tool -> (future, best lane queued) for jobs waiting in the queue
+        self._pending: Dict[str, Tuple[asyncio.Future, int]] = {}
+        # tool -> future of the refresh currently running
+        self._running: Dict[str, asyncio.Future] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        # Workers waiting for a job, and interactive jobs run outside the pool
+        self._idle = 0
+        self._bypass: Set[asyncio.Task] = set()
+
+    # -------------------------
+    # Submission
+    # -------------------------
+    def submit(self, tool: str, lane: int = BACKGROUND) -> asyncio.Future:
+        """
+        Queue a refresh for `tool` and return a future resolving to the new Snapshot.
+        Duplicate submissions share one job; a higher-priority lane re-queues it ahead.
+        """
+        running = self._running.get(tool)
+        if running is not None:
+            return running
+
+        pending = self._pending.get(tool)
+        if pending is not None:
+            fut, queued_lane = pending
+            if lane < queued_lane:
+                if lane == INTERACTIVE and not self._worker_available():
+                    return self._run_now(tool, fut)
+                self._pending[tool] = (fut, lane)
+                self._queue.put_nowait((lane, next(self._seq), tool))
+            return fut
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Background submitters never await the result; don't warn about unretrieved errors.
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if lane == INTERACTIVE and not self._worker_available():
+            return self._run_now(tool, fut)
+        self._pending[tool] = (fut, lane)
+        self._queue.put_nowait((lane, next(self._seq), tool))
+        return fut
+
+    def submit_interactive(self, tool: str) -> asyncio.Future:
+        return self.submit(tool, INTERACTIVE)
+
+    def submit_background(self, tool: str) -> asyncio.Future:
+        return self.submit(tool, BACKGROUND)
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self) -> None:
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"refresh-worker-{i}"))
+        self._tasks.append(asyncio.create_task(self._ticker(), name="refresh-ticker"))
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._bypass)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._bypass.clear()
+        for fut, _lane in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _worker_available(self) -> bool:
+        # Idle workers not already claimed by queued jobs (stale entries count too: conservative)
+        return self._idle > self._queue.qsize()
+
+    def _run_now(self, tool: str, fut: asyncio.Future) -> asyncio.Future:
+        """Run an interactive job right away, outside the worker pool (every worker is busy)."""
+        self._pending.pop(tool, None)  # a queued background entry for it is skipped by the workers
+        self._running[tool] = fut
+        logger.info("Refresh %s: all workers busy, interactive job bypasses the queue", tool)
+
+        async def run() -> None:
+            try:
+                await self._run(tool, INTERACTIVE, fut)
+            finally:
+                if self._running.get(tool) is fut:
+                    del self._running[tool]
+
+        task = asyncio.create_task(run(), name=f"refresh-interactive-{tool}")
+        self._bypass.add(task)
+        task.add_done_callback(self._bypass.discard)
+        return fut
+
+    def _next_due(self, tool: str) -> float:
+        retry_at = self._retry_at.get(tool)
+        if retry_at is not None:
+            return retry_at
+        snap = self.snapshots.peek(tool)
+        if snap is None:
+            return 0.0
+        return snap.fetched_at + self.intervals_sec[tool]
+
+    async def _ticker(self) -> None:
+        while True:
+            now = time.time()
+            next_wake = now + 60.0
+            for tool in self.intervals_sec:
+                due = self._next_due(tool)
+                if due <= now:
+                    self.submit(tool, BACKGROUND)
+                    # Re-evaluated once the job finishes (new fetched_at or retry_at).
+                    due = now + _RETRY_AFTER_SEC
+                next_wake = min(next_wake, due)
+            await asyncio.sleep(max(1.0, next_wake - time.time()))
+
+    async def _worker(self) -> None:
+        while True:
+            self._idle += 1
+            try:
+                lane, _seq, tool = await self._queue.get()
+            finally:
+                self._idle -= 1
+            pending = self._pending.pop(tool, None)
+            if pending is None:
+                # Already served by an earlier (higher-priority) entry.
+                self._queue.task_done()
+                continue
+            fut, _queued_lane = pending
+            self._running[tool] = fut
+            try:
+                await self._run(tool, lane, fut)
+            finally:
+                self._running.pop(tool, None)
+                self._queue.task_done()
+
+    async def _run(self, tool: str, lane: int, fut: asyncio.Future) -> None:
+        t0 = time.time()
+        try:
+            snap: Snapshot = await self.snapshots.refresh(tool, self.loaders[tool])
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            logger.warning("Refresh failed for %s (lane=%s): %s", tool, _LANE_NAMES[lane], e)
+            self._retry_at[tool] = time.time() + min(_RETRY_AFTER_SEC, self.intervals_sec.get(tool, _RETRY_AFTER_SEC))
+            if not fut.done():
+                fut.set_exception(e)
+            return
+
+        self._retry_at.pop(tool, None)
+        logger.info(
+            "Refreshed %s (lane=%s, v%s, %dms)",
+            tool,
+            _LANE_NAMES[lane],
+            snap.version,
+            int((time.time() - t0) * 1000),
+        )
+        if not fut.done():
+            fut.set_result(snap)
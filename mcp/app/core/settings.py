@@ -22,6 +22,35 @@ class Settings(BaseSettings):
         default="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     )
 
+    # Shared HTTP client (connection pool to epitech.eu)
+    http_max_connections: int = Field(default=20, ge=1, le=200)
+    http_max_keepalive_connections: int = Field(default=10, ge=0, le=200)
+    http_keepalive_expiry_sec: float = Field(default=30.0, ge=0)
+    http2: bool = Field(default=False)  # requires the optional 'h2' package
+
+    # HTML parsing off the event loop: process pool size (0 = always parse inline),
+    # pages up to parse_inline_max_bytes are still parsed inline (pool round-trip costs more)
+    parse_workers: int = Field(default=2, ge=0, le=16)
+    parse_inline_max_bytes: int = Field(default=32 * 1024, ge=0)
+
+    # Snapshot cache: serve last good result, refresh in background once older than this
+    snapshot_ttl_sec: int = Field(default=900, ge=0, le=86400)
+    # Persisted snapshots (warm start); older rows are ignored at boot
+    snapshot_store_path: str = Field(default="data/snapshots.sqlite3")
+    snapshot_max_age_sec: int = Field(default=7 * 86400, ge=0)
+
+    # Background refresh scheduler (per-tool cadence, in seconds)
+    scheduler_enabled: bool = Field(default=True)
+    scheduler_workers: int = Field(default=2, ge=1, le=8)
+    refresh_values_sec: int = Field(default=3600, ge=60)
+    refresh_pedagogy_sec: int = Field(default=3600, ge=60)
+    refresh_campus_sec: int = Field(default=6 * 3600, ge=60)
+    refresh_degrees_sec: int = Field(default=12 * 3600, ge=60)
+    refresh_news_sec: int = Field(default=1800, ge=60)
+
+    # Degrees scraping: max catalogue pages fetched at once (one global fan-out)
+    degrees_concurrency: int = Field(default=8, ge=1, le=50)
+
     # Degrees scraping (program discovery)
     degrees_max_pages: int = Field(default=20, ge=1, le=100)
     degrees_seed_urls: List[str] = Field(
@@ -32,6 +61,13 @@ class Settings(BaseSettings):
         ]
     )
 
+    # News scraping: listing page, latest articles kept, article pages fetched at once
+    news_url: str = Field(default="https://www.epitech.eu/actualites/")
+    # RSS/Atom feeds or sitemaps to try before the listing page (empty = <news_url>feed/, then /sitemap.xml)
+    news_feed_urls: List[str] = Field(default=[])
+    news_max_items: int = Field(default=10, ge=1, le=50)
+    news_concurrency: int = Field(default=4, ge=1, le=20)
+
     class Config:
         env_prefix = "MCP_"
         case_sensitive = False
@@ -0,0 +1,93 @@
+"""SQLite persistence for scraper snapshots (warm start after a restart).
+
+One row per tool holding its last successful output. Writes happen after each
+successful refresh; reads happen once, at boot, before serving traffic.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List
+
+from app.core.records import RecordIndex
+from app.core.snapshots import Snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    tool TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    version INTEGER NOT NULL,
+    source_urls TEXT NOT NULL,
+    records TEXT NOT NULL DEFAULT '{}'
+)
+"""
+
+# Columns added after the first release: (name, definition) for ALTER TABLE on older files.
+_MIGRATIONS = [
+    ("records", "TEXT NOT NULL DEFAULT '{}'"),
+]
+
+
+class SnapshotStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshots)")}
+            for name, definition in _MIGRATIONS:
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE snapshots ADD COLUMN {name} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Short-lived connections: calls come from worker threads (asyncio.to_thread).
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def save(self, tool: str, snap: Snapshot, source_urls: List[str]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (tool, data, duration_ms, fetched_at, version, source_urls, records) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    tool,
+                    json.dumps(snap.data, ensure_ascii=False),
+                    snap.duration_ms,
+                    snap.fetched_at,
+                    snap.version,
+                    json.dumps(source_urls),
+                    snap.records.to_json(),
+                ),
+            )
+
+    def load_all(self, max_age_sec: float) -> Dict[str, Snapshot]:
+        """Return persisted snapshots younger than max_age_sec (older rows are ignored)."""
+        cutoff = time.time() - max_age_sec
+        out: Dict[str, Snapshot] = {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT tool, data, duration_ms, fetched_at, version, records FROM snapshots WHERE fetched_at >= ?",
+                (cutoff,),
+            ).fetchall()
+        for tool, data, duration_ms, fetched_at, version, records in rows:
+            try:
+                out[tool] = Snapshot(
+                    data=json.loads(data),
+                    duration_ms=duration_ms,
+                    fetched_at=fetched_at,
+                    version=version,
+                    records=RecordIndex.from_json(records),
+                )
+            except ValueError:
+                logger.warning("Ignoring unreadable persisted snapshot for %s", tool)
+        return out
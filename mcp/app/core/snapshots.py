@@ -0,0 +1,159 @@
+"""In-memory snapshot cache for scraper outputs (stale-while-revalidate).
+
+Every tool keeps its last good result. Fresh snapshots are served as-is, stale
+ones are served immediately while a single background refresh replaces them.
+Only a cold cache (no snapshot yet) makes the caller wait for the network.
+
+Snapshot versions are content versions: a refresh that returns the same
+records (see app/core/records.py) keeps the version and only renews fetched_at.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Set, Tuple
+
+from app.core.records import RecordIndex, RecordsFn, next_version, whole_payload
+
+if TYPE_CHECKING:
+    from app.core.scheduler import RefreshScheduler
+
+
+logger = logging.getLogger(__name__)
+
+# A loader returns (data, duration_ms), like every scrape_* function.
+Loader = Callable[[], Awaitable[Tuple[Any, int]]]
+# Called after every successful refresh (e.g. to persist the snapshot).
+UpdateHook = Callable[[str, "Snapshot"], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    data: Any
+    duration_ms: int
+    fetched_at: float
+    version: int
+    records: RecordIndex = field(default_factory=RecordIndex)
+
+    @property
+    def age_ms(self) -> int:
+        return max(0, int((time.time() - self.fetched_at) * 1000))
+
+
+class SnapshotCache:
+    def __init__(
+        self,
+        ttl_sec: float,
+        on_update: UpdateHook | None = None,
+        ttl_by_tool: Dict[str, float] | None = None,
+        records_by_tool: Dict[str, RecordsFn] | None = None,
+    ) -> None:
+        self.ttl_sec = ttl_sec
+        self.on_update = on_update
+        self.ttl_by_tool = ttl_by_tool or {}
+        self.records_by_tool = records_by_tool or {}
+        # When attached, refreshes go through the scheduler's priority lanes instead of inline tasks.
+        self.scheduler: RefreshScheduler | None = None
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        # Single-flight: concurrent cold callers share one scrape per tool.
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Callers that joined an in-flight scrape instead of starting their own (cumulative, per tool).
+        self.coalesced_waiters: Dict[str, int] = {}
+
+    def peek(self, tool: str) -> Snapshot | None:
+        return self._snapshots.get(tool)
+
+    def put(self, tool: str, snap: Snapshot) -> None:
+        """Seed a snapshot without calling the loader (warm start)."""
+        self._snapshots[tool] = snap
+
+    def records(self, tool: str, data: Any) -> Dict[str, Any]:
+        return self.records_by_tool.get(tool, whole_payload)(data)
+
+    def is_stale(self, tool: str, snap: Snapshot) -> bool:
+        ttl = self.ttl_by_tool.get(tool, self.ttl_sec)
+        return (time.time() - snap.fetched_at) >= ttl
+
+    async def get(self, tool: str, loader: Loader) -> Tuple[Snapshot, bool]:
+        """
+        Returns (snapshot, cached).
+        `cached` is False only when the caller had to wait for a fresh scrape.
+        Loader exceptions propagate on a cold cache only.
+        """
+        snap = self._snapshots.get(tool)
+        if snap is None:
+            return await self._single_flight(tool, loader), False
+
+        if not self.is_stale(tool, snap):
+            return snap, True
+        if self.scheduler is not None:
+            self.scheduler.submit_background(tool)
+        elif tool not in self._refreshing:
+            self._refreshing.add(tool)
+            task = asyncio.create_task(self._background_refresh(tool, loader))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return snap, True
+
+    async def _single_flight(self, tool: str, loader: Loader) -> Snapshot:
+        fut = self._inflight.get(tool)
+        if fut is not None:
+            self.coalesced_waiters[tool] = self.coalesced_waiters.get(tool, 0) + 1
+        else:
+            if self.scheduler is not None:
+                fut = self.scheduler.submit_interactive(tool)
+            else:
+                fut = asyncio.ensure_future(self.refresh(tool, loader))
+            self._inflight[tool] = fut
+
+            def _done(f: asyncio.Future) -> None:
+                if self._inflight.get(tool) is f:
+                    del self._inflight[tool]
+
+            fut.add_done_callback(_done)
+        # Shield: a disconnecting client must not cancel a scrape other callers share.
+        return await asyncio.shield(fut)
+
+    async def refresh(self, tool: str, loader: Loader) -> Snapshot:
+        data, duration_ms = await loader()
+        prev = self._snapshots.get(tool)
+        version, index = next_version(
+            prev.version if prev else 0,
+            prev.records if prev else RecordIndex(),
+            self.records(tool, data),
+        )
+        snap = Snapshot(
+            data=data,
+            duration_ms=duration_ms,
+            fetched_at=time.time(),
+            version=version,
+            records=index,
+        )
+        self._snapshots[tool] = snap
+        if self.on_update is not None:
+            try:
+                await self.on_update(tool, snap)
+            except Exception:
+                logger.exception("Snapshot update hook failed for %s", tool)
+        return snap
+
+    async def _background_refresh(self, tool: str, loader: Loader) -> None:
+        try:
+            snap = await self.refresh(tool, loader)
+            logger.info("Refreshed %s snapshot (v%s, %sms)", tool, snap.version, snap.duration_ms)
+        except Exception:
+            # Keep serving the last good snapshot; the next stale hit retries.
+            logger.exception("Background refresh failed for %s", tool)
+        finally:
+            self._refreshing.discard(tool)
+
+    async def aclose(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
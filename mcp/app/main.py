@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
 
+from app.core.news_store import NewsStore
+from app.core.records import RecordsFn, whole_payload
+from app.core.scheduler import RefreshScheduler
 from app.core.settings import Settings, get_settings
-from app.services.epitech_contact import scrape_campuses
-from app.services.epitech_degrees import scrape_degrees
-from app.services.epitech_pedagogy import scrape_pedagogy
-from app.services.epitech_values import scrape_values
+from app.core.snapshot_store import SnapshotStore
+from app.core.snapshots import Loader, Snapshot, SnapshotCache
+from app.services.epitech_contact import CONTACT_URL, campus_records, scrape_campuses
+from app.services.epitech_degrees import degree_records, scrape_degrees
+from app.services.epitech_news import news_records, scrape_news
+from app.services.epitech_pedagogy import PEDAGOGY_URL, scrape_pedagogy
+from app.services.epitech_values import VALUES_URL, scrape_values
+from app.services.http_fetch import create_http_client, create_parse_pool, fetcher
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _Tool:
+    loader: Loader
+    source: str
+    source_urls: Callable[[Any], List[str]]
+    # Whether meta carries item_count (list payloads only)
+    with_count: bool = False
+    # Split into keyed records for change tracking (/scrape/{tool}/changes)
+    records: RecordsFn = whole_payload
+
+
+class BatchRequest(BaseModel):
+    tools: List[str] = Field(min_length=1)
+    # Optional tool -> snapshot_version already held by the caller; unchanged tools come back without data
+    since: Dict[str, int] = Field(default_factory=dict)
+
+
 def create_app(settings: Settings | None = None) -> FastAPI:
     settings = settings or get_settings()
 
@@ -25,7 +53,119 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    app = FastAPI(title="MCP Server", version="1.0.0")
+    def _scrape_args() -> Dict[str, Any]:
+        return {
+            "timeout_sec": settings.scrape_timeout_sec,
+            "user_agent": settings.user_agent,
+            # Pooled client created in the lifespan (keep-alive + TLS reuse across scrapes)
+            "client": getattr(app.state, "http_client", None),
+        }
+
+    # Append-only news items + feed cursor, in the same SQLite file as the snapshots
+    news_store = NewsStore(settings.snapshot_store_path)
+
+    tools: Dict[str, _Tool] = {
+        "campus": _Tool(
+            loader=lambda: scrape_campuses(**_scrape_args()),
+            source="epitech.eu/contact",
+            with_count=True,
+            source_urls=lambda data: [CONTACT_URL],
+            records=campus_records,
+        ),
+        "degrees": _Tool(
+            loader=lambda: scrape_degrees(**_scrape_args(), concurrency=settings.degrees_concurrency),
+            source="epitech.eu (official catalogue urls)",
+            with_count=True,
+            source_urls=lambda data: [p.get("url") for prog in data for p in prog.get("pages", []) if p.get("url")],
+            records=degree_records,
+        ),
+        "pedagogy": _Tool(
+            loader=lambda: scrape_pedagogy(**_scrape_args()),
+            source="epitech.eu/ecole-informatique-apres-bac/pedagogie",
+            source_urls=lambda data: [PEDAGOGY_URL],
+        ),
+        "values": _Tool(
+            loader=lambda: scrape_values(**_scrape_args()),
+            source="epitech.eu/ecole-informatique-apres-bac/engagements",
+            source_urls=lambda data: [VALUES_URL],
+        ),
+        "news": _Tool(
+            loader=lambda: scrape_news(
+                **_scrape_args(),
+                news_url=settings.news_url,
+                max_items=settings.news_max_items,
+                concurrency=settings.news_concurrency,
+                feed_urls=settings.news_feed_urls,
+                store=news_store,
+            ),
+            source=settings.news_url,
+            with_count=True,
+            source_urls=lambda data: [settings.news_url] + [item["link"] for item in data],
+            records=news_records,
+        ),
+    }
+
+    store = SnapshotStore(settings.snapshot_store_path)
+
+    async def _persist(tool: str, snap: Snapshot) -> None:
+        await asyncio.to_thread(store.save, tool, snap, tools[tool].source_urls(snap.data))
+
+    refresh_intervals_sec: Dict[str, float] = {
+        "campus": settings.refresh_campus_sec,
+        "degrees": settings.refresh_degrees_sec,
+        "pedagogy": settings.refresh_pedagogy_sec,
+        "values": settings.refresh_values_sec,
+        "news": settings.refresh_news_sec,
+    }
+
+    # Last good result per tool; stale entries are served while refreshing in background.
+    # With the scheduler on, a snapshot only counts as stale once its tool cadence was missed.
+    snapshots = SnapshotCache(
+        ttl_sec=settings.snapshot_ttl_sec,
+        on_update=_persist,
+        ttl_by_tool=refresh_intervals_sec if settings.scheduler_enabled else None,
+        records_by_tool={name: spec.records for name, spec in tools.items()},
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        app.state.http_client = create_http_client(settings)
+        parse_pool = create_parse_pool(settings)
+        fetcher.executor = parse_pool
+        fetcher.inline_max_bytes = settings.parse_inline_max_bytes
+
+        # Warm start: serve persisted snapshots (stale ones get refreshed on first hit).
+        warm = await asyncio.to_thread(store.load_all, settings.snapshot_max_age_sec)
+        for tool, snap in warm.items():
+            if tool in tools:
+                snapshots.put(tool, snap)
+        if warm:
+            logger.info("Loaded %d persisted snapshots from %s", len(warm), settings.snapshot_store_path)
+
+        scheduler: RefreshScheduler | None = None
+        if settings.scheduler_enabled:
+            scheduler = RefreshScheduler(
+                snapshots,
+                loaders={name: spec.loader for name, spec in tools.items()},
+                intervals_sec=refresh_intervals_sec,
+                workers=settings.scheduler_workers,
+            )
+            snapshots.scheduler = scheduler
+            scheduler.start()
+        try:
+            yield
+        finally:
+            if scheduler is not None:
+                snapshots.scheduler = None
+                await scheduler.stop()
+            await snapshots.aclose()
+            await app.state.http_client.aclose()
+            if parse_pool is not None:
+                fetcher.executor = None
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    app = FastAPI(title="MCP Server", version="1.0.0", lifespan=lifespan)
+    app.state.snapshots = snapshots
 
     app.add_middleware(
         CORSMiddleware,
@@ -39,27 +179,38 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     async def healthz() -> Dict[str, str]:
         return {"status": "ok"}
 
-    @app.post("/scrape/campus")
-    async def scrape_campus() -> Dict[str, Any]:
-        t0 = time.time()
+    async def _snapshot(tool: str) -> Tuple[Snapshot, bool]:
         try:
-            campuses, duration_ms = await scrape_campuses(
-                timeout_sec=settings.scrape_timeout_sec,
-                user_agent=settings.user_agent,
-            )
+            return await snapshots.get(tool, tools[tool].loader)
         except Exception as e:
-            logger.exception("Failed to scrape campuses")
+            logger.exception("Failed to scrape %s", tool)
             raise HTTPException(status_code=502, detail=str(e))
 
-        return {
-            "data": campuses,
-            "meta": {
-                "source": "epitech.eu/contact",
-                "item_count": len(campuses),
-                "duration_ms": duration_ms,
+    def _meta(tool: str, snap: Snapshot, cached: bool, t0: float) -> Dict[str, Any]:
+        spec = tools[tool]
+        meta: Dict[str, Any] = {"source": spec.source}
+        if spec.with_count:
+            meta["item_count"] = len(snap.data)
+        meta.update(
+            {
+                "duration_ms": snap.duration_ms,
                 "server_ms": int((time.time() - t0) * 1000),
-            },
-        }
+                "cached": cached,
+                "age_ms": snap.age_ms,
+                "snapshot_version": snap.version,
+                "coalesced_waiters": snapshots.coalesced_waiters.get(tool, 0),
+            }
+        )
+        return meta
+
+    async def _serve(tool: str) -> Dict[str, Any]:
+        t0 = time.time()
+        snap, cached = await _snapshot(tool)
+        return {"data": snap.data, "meta": _meta(tool, snap, cached, t0)}
+
+    @app.post("/scrape/campus")
+    async def scrape_campus() -> Dict[str, Any]:
+        return await _serve("campus")
 
     # GET alias (idempotent + nice to test in a browser/curl)
     @app.get("/scrape/campus")
@@ -68,25 +219,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
 
     @app.post("/scrape/degrees")
     async def scrape_degrees_endpoint() -> Dict[str, Any]:
-        t0 = time.time()
-        try:
-            degrees, duration_ms = await scrape_degrees(
-                timeout_sec=settings.scrape_timeout_sec,
-                user_agent=settings.user_agent,
-            )
-        except Exception as e:
-            logger.exception("Failed to scrape degrees")
-            raise HTTPException(status_code=502, detail=str(e))
-
-        return {
-            "data": degrees,
-            "meta": {
-                "source": "epitech.eu (official catalogue urls)",
-                "item_count": len(degrees),
-                "duration_ms": duration_ms,
-                "server_ms": int((time.time() - t0) * 1000),
-            },
-        }
+        return await _serve("degrees")
 
     # GET alias
     @app.get("/scrape/degrees")
@@ -95,24 +228,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
 
     @app.post("/scrape/pedagogy")
     async def scrape_pedagogy_endpoint() -> Dict[str, Any]:
-        t0 = time.time()
-        try:
-            pedagogy, duration_ms = await scrape_pedagogy(
-                timeout_sec=settings.scrape_timeout_sec,
-                user_agent=settings.user_agent,
-            )
-        except Exception as e:
-            logger.exception("Failed to scrape pedagogy")
-            raise HTTPException(status_code=502, detail=str(e))
-
-        return {
-            "data": pedagogy,
-            "meta": {
-                "source": "epitech.eu/ecole-informatique-apres-bac/pedagogie",
-                "duration_ms": duration_ms,
-                "server_ms": int((time.time() - t0) * 1000),
-            },
-        }
+        return await _serve("pedagogy")
 
     @app.get("/scrape/pedagogy")
     async def scrape_pedagogy_get() -> Dict[str, Any]:
@@ -120,28 +236,75 @@ def create_app(settings: Settings | None = None) -> FastAPI:
 
     @app.post("/scrape/values")
     async def scrape_values_endpoint() -> Dict[str, Any]:
-        t0 = time.time()
-        try:
-            values, duration_ms = await scrape_values(
-                timeout_sec=settings.scrape_timeout_sec,
-                user_agent=settings.user_agent,
-            )
-        except Exception as e:
-            logger.exception("Failed to scrape values")
-            raise HTTPException(status_code=502, detail=str(e))
-
-        return {
-            "data": values,
-            "meta": {
-                "source": "epitech.eu/ecole-informatique-apres-bac/engagements",
-                "duration_ms": duration_ms,
-                "server_ms": int((time.time() - t0) * 1000),
-            },
-        }
+        return await _serve("values")
 
     @app.get("/scrape/values")
     async def scrape_values_get() -> Dict[str, Any]:
         return await scrape_values_endpoint()
 
+    @app.post("/scrape/news")
+    async def scrape_news_endpoint() -> Dict[str, Any]:
+        return await _serve("news")
+
+    @app.get("/scrape/news")
+    async def scrape_news_get() -> Dict[str, Any]:
+        return await scrape_news_endpoint()
+
+    @app.post("/scrape/batch")
+    async def scrape_batch(req: BatchRequest) -> Dict[str, Any]:
+        """
+        Several tools in one round trip. Each result is either {data, meta}, {unchanged: true, meta}
+        (when `since` matches the current snapshot version) or {error, status}; one failing tool
+        does not fail the batch.
+        """
+        names = list(dict.fromkeys(req.tools))
+
+        async def one(tool: str) -> Dict[str, Any]:
+            if tool not in tools:
+                return {"error": f"Unknown tool: {tool}", "status": 404}
+            t0 = time.time()
+            try:
+                snap, cached = await _snapshot(tool)
+            except HTTPException as e:
+                return {"error": e.detail, "status": e.status_code}
+            meta = _meta(tool, snap, cached, t0)
+            if req.since.get(tool) == snap.version:
+                return {"unchanged": True, "meta": meta}
+            return {"data": snap.data, "meta": meta}
+
+        results = await asyncio.gather(*(one(tool) for tool in names))
+        return {"results": dict(zip(names, results))}
+
+    @app.get("/scrape/{tool}/changes")
+    async def scrape_changes(tool: str, since: int = Query(default=0, ge=0)) -> Dict[str, Any]:
+        """
+        Records added/changed after version `since`, plus keys removed since then.
+        since=0 returns every record. A `since` ahead of the server (e.g. its store was wiped)
+        is answered with a full resync and reset=true.
+        """
+        if tool not in tools:
+            raise HTTPException(status_code=404, detail=f"Unknown tool: {tool}")
+        t0 = time.time()
+        snap, cached = await _snapshot(tool)
+
+        reset = since > snap.version
+        if reset:
+            since = 0
+        changed_keys, removed_keys = snap.records.changed_since(since)
+        records = snapshots.records(tool, snap.data)
+        return {
+            "tool": tool,
+            "version": snap.version,
+            "since": since,
+            "reset": reset,
+            "changed": [
+                {"key": key, "version": snap.records.versions[key], "record": records[key]}
+                for key in changed_keys
+                if key in records
+            ],
+            "removed": removed_keys,
+            "meta": _meta(tool, snap, cached, t0),
+        }
+
     return app
 
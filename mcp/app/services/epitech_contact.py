@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import html as _html
 import re
+import time
 from typing import Dict, List, Tuple
 
 import httpx
 
+from app.services.html_extract import extract_page
+from app.services.http_fetch import fetcher, scraper_client
+
 
 CONTACT_URL = "https://www.epitech.eu/contact/"
 
@@ -83,33 +86,6 @@ def _extract_cities_from_text(text: str) -> List[str]:
     return candidates
 
 
-def _html_to_text_lines(raw_html: str) -> List[str]:
-    """
-    Convert HTML to a reasonably stable text-lines representation using only stdlib + regex.
-    We intentionally avoid relying on specific DOM structures.
-    """
-    if not raw_html:
-        return []
-
-    s = raw_html
-    # Remove scripts/styles
-    s = re.sub(r"(?is)<script[^>]*>.*?</script>", "\n", s)
-    s = re.sub(r"(?is)<style[^>]*>.*?</style>", "\n", s)
-    # Turn common block separators into newlines
-    s = re.sub(r"(?i)<br\s*/?>", "\n", s)
-    s = re.sub(r"(?i)</(p|div|li|h1|h2|h3|h4|section|article)>", "\n", s)
-    # Drop remaining tags
-    s = re.sub(r"(?is)<[^>]+>", "", s)
-    # Unescape HTML entities
-    s = _html.unescape(s)
-    # Normalize whitespace
-    s = s.replace("\r", "\n")
-    s = re.sub(r"[ \t]+\n", "\n", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
-    lines = [ln.strip(" \t\u00a0") for ln in s.split("\n")]
-    return [ln for ln in lines if ln]
-
-
 def _extract_contact_blocks(lines: List[str]) -> Dict[str, Dict[str, object]]:
     """
     Extract per-campus contact blocks from the contact page text.
@@ -184,20 +160,11 @@ def _extract_contact_blocks(lines: List[str]) -> Dict[str, Dict[str, object]]:
     return blocks
 
 
-async def scrape_campuses(timeout_sec: int, user_agent: str) -> Tuple[List[Dict], int]:
+def _parse_campuses(raw_html: str) -> List[Dict]:
     """
-    Returns (campus_list, duration_ms)
+    Build the campus list from the contact page HTML.
     Output campus_list item schema matches what the backend expects.
     """
-    headers = {"User-Agent": user_agent}
-    async with httpx.AsyncClient(timeout=timeout_sec, headers=headers, follow_redirects=True) as client:
-        import time
-        start = time.time()
-        r = await client.get(CONTACT_URL)
-        r.raise_for_status()
-        raw_html = r.text
-        duration_ms = int((time.time() - start) * 1000)
-
     # 1) Preferred: extract from "Epitech à <Ville>" headings in the page text
     found = set()
     for city in _extract_cities_from_text(raw_html):
@@ -212,7 +179,7 @@ async def scrape_campuses(timeout_sec: int, user_agent: str) -> Tuple[List[Dict]
             found.add(city)
 
     # 3) Extract contact details (address/email/phone) per campus from the same page
-    lines = _html_to_text_lines(raw_html)
+    lines = extract_page(raw_html).lines()
     contact_blocks = _extract_contact_blocks(lines)
 
     campuses = []
@@ -232,5 +199,24 @@ async def scrape_campuses(timeout_sec: int, user_agent: str) -> Tuple[List[Dict]
             }
         )
 
-    return campuses, duration_ms
+    return campuses
 
+
+def campus_records(campuses: List[Dict]) -> Dict[str, Dict]:
+    """Change-tracking records: one per campus, keyed by city."""
+    return {c["ville"]: c for c in campuses}
+
+
+async def scrape_campuses(
+    timeout_sec: int, user_agent: str, client: httpx.AsyncClient | None = None
+) -> Tuple[List[Dict], int]:
+    """
+    Returns (campus_list, duration_ms)
+    """
+    async with scraper_client(client, timeout_sec, user_agent) as client:
+        start = time.time()
+        # Unchanged page (304 / same body) reuses the previous extraction.
+        campuses = await fetcher.fetch(client, CONTACT_URL, _parse_campuses)
+        duration_ms = int((time.time() - start) * 1000)
+
+    return campuses, duration_ms
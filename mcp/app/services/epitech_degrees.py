@@ -3,11 +3,13 @@ from __future__ import annotations
 import asyncio
 import re
 import time
-from html import unescape
 from typing import Any, Dict, List, Tuple
 
 import httpx
 
+from app.services.html_extract import extract_page
+from app.services.http_fetch import fetcher, scraper_client
+
 
 # Official program pages (provided list) – used as the source of truth.
 DEGREES_CATALOG: List[Dict[str, Any]] = [
@@ -67,50 +69,10 @@ DEGREES_CATALOG: List[Dict[str, Any]] = [
 ]
 
 
-def _strip_tags(html: str) -> str:
-    html = re.sub(r"(?is)<(script|style)[^>]*>.*?</\1>", " ", html)
-    text = re.sub(r"(?s)<[^>]+>", " ", html)
-    text = unescape(text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def _extract_meta(html: str, name: str) -> str | None:
-    # <meta name="description" content="...">
-    m = re.search(
-        rf'(?is)<meta[^>]+name=["\']{re.escape(name)}["\'][^>]+content=["\']([^"\']+)["\']',
-        html,
-    )
-    return unescape(m.group(1)).strip() if m else None
-
-
-def _extract_og(html: str, prop: str) -> str | None:
-    # <meta property="og:title" content="...">
-    m = re.search(
-        rf'(?is)<meta[^>]+property=["\']{re.escape(prop)}["\'][^>]+content=["\']([^"\']+)["\']',
-        html,
-    )
-    return unescape(m.group(1)).strip() if m else None
-
-
-def _extract_title(html: str) -> str | None:
-    m = re.search(r"(?is)<title[^>]*>(.*?)</title>", html)
-    if not m:
-        return None
-    return unescape(re.sub(r"\s+", " ", m.group(1))).strip()
-
-
-def _extract_h1(html: str) -> str | None:
-    m = re.search(r"(?is)<h1[^>]*>(.*?)</h1>", html)
-    if not m:
-        return None
-    return unescape(_strip_tags(m.group(1)))
-
-
 def _short_snippet(text: str, max_len: int = 320) -> str | None:
     if not text:
         return None
-    t = re.sub(r"\s+", " ", text).strip()
+    t = " ".join(text.split())
     if len(t) <= max_len:
         return t
     cut = t[:max_len]
@@ -147,55 +109,84 @@ def _extract_duration_hints(text: str) -> List[str]:
     return found
 
 
-async def scrape_degrees(timeout_sec: int, user_agent: str) -> Tuple[List[Dict[str, Any]], int]:
+def _parse_degree_page(html: str) -> Dict[str, Any]:
+    page = extract_page(html)
+    text = page.text()
+    return {
+        "title": page.og.get("og:title") or page.title,
+        "h1": page.h1,
+        "description": page.meta.get("description") or page.og.get("og:description"),
+        "snippet": _short_snippet(text, 360),
+        "duration_hints": _extract_duration_hints(text),
+    }
+
+
+def degree_records(programs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Change-tracking records: one per catalogue page, keyed by URL.
+    fetch_ms is left out (it changes on every crawl); the program name is kept for context.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for program in programs:
+        for page in program.get("pages", []):
+            record = {k: v for k, v in page.items() if k != "fetch_ms"}
+            record["programme"] = program.get("nom")
+            out[page["url"]] = record
+    return out
+
+
+async def scrape_degrees(
+    timeout_sec: int,
+    user_agent: str,
+    client: httpx.AsyncClient | None = None,
+    concurrency: int = 8,
+) -> Tuple[List[Dict[str, Any]], int]:
     """
     Returns (programs, duration_ms)
 
+    All catalogue pages are fetched in one global fan-out (bounded by `concurrency`),
+    then regrouped per program, so the crawl takes about as long as its slowest pages.
+
     Output schema:
       [
         {
           nom, categorie, niveau,
-          pages: [{url, title, h1, description, snippet}]
+          pages: [{url, title, h1, description, snippet, duration_hints, fetch_ms}]
         }, ...
       ]
     """
-    headers = {"User-Agent": user_agent}
     start = time.time()
 
-    async with httpx.AsyncClient(timeout=timeout_sec, headers=headers, follow_redirects=True) as client:
-        sem = asyncio.Semaphore(8)
+    async with scraper_client(client, timeout_sec, user_agent) as client:
+        sem = asyncio.Semaphore(concurrency)
 
         async def fetch(url: str) -> Dict[str, Any]:
             async with sem:
+                t0 = time.time()
                 try:
-                    r = await client.get(url)
-                    r.raise_for_status()
-                    html = r.text or ""
-                    text = _strip_tags(html)
-                    return {
-                        "url": url,
-                        "title": _extract_og(html, "og:title") or _extract_title(html),
-                        "h1": _extract_h1(html),
-                        "description": _extract_meta(html, "description") or _extract_og(html, "og:description"),
-                        "snippet": _short_snippet(text, 360),
-                        "duration_hints": _extract_duration_hints(text),
-                    }
+                    page = await fetcher.fetch(client, url, _parse_degree_page)
+                    item = {"url": url, **page}
                 except Exception as e:
-                    return {"url": url, "error": str(e)}
-
-        out: List[Dict[str, Any]] = []
-        for program in DEGREES_CATALOG:
-            urls = program.get("pages", [])
-            page_items = await asyncio.gather(*[fetch(u) for u in urls])
-            out.append(
-                {
-                    "nom": program["nom"],
-                    "categorie": program["categorie"],
-                    "niveau": program["niveau"],
-                    "pages": page_items,
-                }
-            )
+                    item = {"url": url, "error": str(e)}
+                item["fetch_ms"] = int((time.time() - t0) * 1000)
+                return item
+
+        jobs = [(i, url) for i, program in enumerate(DEGREES_CATALOG) for url in program.get("pages", [])]
+        results = await asyncio.gather(*[fetch(url) for _i, url in jobs])
+
+    pages_by_program: Dict[int, List[Dict[str, Any]]] = {i: [] for i in range(len(DEGREES_CATALOG))}
+    for (i, _url), item in zip(jobs, results):
+        pages_by_program[i].append(item)
+
+    out: List[Dict[str, Any]] = [
+        {
+            "nom": program["nom"],
+            "categorie": program["categorie"],
+            "niveau": program["niveau"],
+            "pages": pages_by_program[i],
+        }
+        for i, program in enumerate(DEGREES_CATALOG)
+    ]
 
     duration_ms = int((time.time() - start) * 1000)
     return out, duration_ms
-
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import httpx
+
+from app.core.news_store import NewsCursor, NewsStore
+from app.services.html_extract import extract_links, extract_page
+from app.services.http_fetch import fetcher, scraper_client
+
+
+logger = logging.getLogger(__name__)
+
+NEWS_URL = "https://www.epitech.eu/actualites/"
+
+# Listing links that are not articles (pagination, taxonomy pages, feeds)
+_NOT_ARTICLE_RE = re.compile(r"/(?:page|category|categorie|tag|author|feed)(?:/|$)", re.IGNORECASE)
+
+# Sitemap indexes can list many child sitemaps; only the most recently modified ones are read.
+_MAX_CHILD_SITEMAPS = 5
+
+
+def _short_summary(text: str, max_len: int = 280) -> str:
+    t = " ".join((text or "").split())
+    if len(t) <= max_len:
+        return t
+    return t[:max_len].rsplit(" ", 1)[0] + "…"
+
+
+def _timestamp(raw: str | None) -> float:
+    """Epoch seconds from an RFC 822 (RSS) or ISO 8601 (Atom, sitemap lastmod) date; 0 if unreadable."""
+    if not raw:
+        return 0.0
+    raw = raw.strip()
+    try:
+        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _local(tag: str) -> str:
+    # "{http://www.w3.org/2005/Atom}entry" -> "entry"
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(el: ET.Element, name: str) -> str | None:
+    for child in el:
+        if _local(child.tag) == name:
+            return (child.text or "").strip() or None
+    return None
+
+
+def _parse_feed(xml: bytes) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Parse an RSS 2.0 / Atom feed or an XML sitemap (index), from the raw response
+    bytes so the encoding declared by the document is honored.
+    Returns (kind, entries); entries always have `link` and `published_at`
+    (0 when undated), feeds also give title/summary/date. Raises ValueError on anything else.
+    """
+    try:
+        root = ET.fromstring(xml.strip())
+    except ET.ParseError as e:
+        raise ValueError(f"not an XML feed: {e}") from None
+
+    kind = _local(root.tag)
+    entries: List[Dict[str, Any]] = []
+    if kind == "rss":
+        for item in root.iter():
+            if _local(item.tag) != "item":
+                continue
+            date = _child_text(item, "pubDate")
+            summary = _child_text(item, "description")
+            entries.append(
+                {
+                    "link": _child_text(item, "link"),
+                    "title": _child_text(item, "title"),
+                    "summary": _short_summary(extract_page(summary).text()) if summary else None,
+                    "date": date,
+                    "published_at": _timestamp(date),
+                }
+            )
+    elif kind == "feed":
+        kind = "atom"
+        for entry in root:
+            if _local(entry.tag) != "entry":
+                continue
+            link = next(
+                (c.get("href") for c in entry if _local(c.tag) == "link" and c.get("rel", "alternate") == "alternate"),
+                None,
+            )
+            date = _child_text(entry, "published") or _child_text(entry, "updated")
+            summary = _child_text(entry, "summary") or _child_text(entry, "content")
+            entries.append(
+                {
+                    "link": link,
+                    "title": _child_text(entry, "title"),
+                    "summary": _short_summary(extract_page(summary).text()) if summary else None,
+                    "date": date,
+                    "published_at": _timestamp(date),
+                }
+            )
+    elif kind in ("urlset", "sitemapindex"):
+        kind = "sitemap" if kind == "urlset" else "sitemapindex"
+        for url in root:
+            lastmod = _child_text(url, "lastmod")
+            entries.append({"link": _child_text(url, "loc"), "date": lastmod, "published_at": _timestamp(lastmod)})
+    else:
+        raise ValueError(f"unsupported feed root <{kind}>")
+
+    return kind, [e for e in entries if e.get("link")]
+
+
+def _parse_news_listing(html: str) -> List[str]:
+    # Raw hrefs only: resolving/filtering needs the listing URL, done in `article_urls`.
+    return extract_links(html)
+
+
+def _is_article_url(listing_url: str, url: str) -> bool:
+    """Same host as the listing, strictly below its path, and not a pagination/taxonomy page."""
+    base = urlparse(listing_url)
+    prefix = base.path if base.path.endswith("/") else base.path + "/"
+    u = urlparse(url)
+    if u.netloc != base.netloc or not u.path.startswith(prefix) or u.path.rstrip("/") == prefix.rstrip("/"):
+        return False
+    return not _NOT_ARTICLE_RE.search(u.path[len(prefix) - 1 :])
+
+
+def article_urls(listing_url: str, hrefs: List[str], max_items: int) -> List[str]:
+    """Article pages linked from the listing, in page order."""
+    out: List[str] = []
+    for href in hrefs:
+        url = urldefrag(urljoin(listing_url, href))[0]
+        if url in out or not _is_article_url(listing_url, url):
+            continue
+        out.append(url)
+        if len(out) >= max_items:
+            break
+    return out
+
+
+def _parse_news_article(html: str) -> Dict[str, Any]:
+    page = extract_page(html)
+    summary = page.og.get("og:description") or page.meta.get("description")
+    return {
+        "title": page.og.get("og:title") or page.h1 or page.title or "Sans titre",
+        "summary": summary or _short_summary(page.text()),
+        "date": page.og.get("article:published_time") or page.meta.get("date"),
+    }
+
+
+def feed_candidates(news_url: str, feed_urls: List[str]) -> List[str]:
+    """Configured feed/sitemap URLs, or the usual locations next to the news listing."""
+    if feed_urls:
+        return list(feed_urls)
+    return [urljoin(news_url, "feed/"), urljoin(news_url, "/sitemap.xml")]
+
+
+def news_records(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Change-tracking records: one per article, keyed by link."""
+    return {item["link"]: item for item in items}
+
+
+async def _feed_entries(
+    client: httpx.AsyncClient, news_url: str, source_url: str, cursor: float
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Entries of one feed/sitemap newer than `cursor`, plus undated ones (the caller dedupes
+    those on link). Sitemap indexes are followed one level.
+    """
+    kind, entries = await fetcher.fetch(client, source_url, _parse_feed, raw=True)
+    if kind == "sitemapindex":
+        children = sorted(
+            (e for e in entries if not e["published_at"] or e["published_at"] > cursor),
+            key=lambda e: e["published_at"],
+            reverse=True,
+        )[:_MAX_CHILD_SITEMAPS]
+        results = await asyncio.gather(
+            *[fetcher.fetch(client, c["link"], _parse_feed, raw=True) for c in children], return_exceptions=True
+        )
+        entries = []
+        for child, result in zip(children, results):
+            if isinstance(result, BaseException):
+                logger.warning("News: skipping child sitemap %s: %s", child["link"], result)
+                continue
+            entries.extend(result[1])
+    if kind in ("sitemap", "sitemapindex"):
+        # Sitemaps list the whole site: keep article pages below the news listing.
+        entries = [e for e in entries if _is_article_url(news_url, e["link"])]
+    return kind, [e for e in entries if not e["published_at"] or e["published_at"] > cursor]
+
+
+async def _discover(
+    client: httpx.AsyncClient, news_url: str, candidates: List[str]
+) -> Tuple[NewsCursor, List[Dict[str, Any]]] | None:
+    """First candidate that parses as a feed/sitemap with at least one news entry (and its entries)."""
+    for url in candidates:
+        try:
+            kind, entries = await _feed_entries(client, news_url, url, 0.0)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.info("News: %s is not a usable feed (%s)", url, e)
+            continue
+        if entries:
+            logger.info("News: using %s feed %s", kind, url)
+            return NewsCursor(source_url=url, kind=kind, cursor=0.0), entries
+    return None
+
+
+async def scrape_news(
+    timeout_sec: int,
+    user_agent: str,
+    client: httpx.AsyncClient | None = None,
+    news_url: str = NEWS_URL,
+    max_items: int = 10,
+    concurrency: int = 4,
+    feed_urls: List[str] | None = None,
+    store: NewsStore | None = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Returns (articles, duration_ms)
+
+    Sources, cheapest first:
+      1. an RSS/Atom feed or sitemap (found once among `feed_candidates`, then remembered
+         in the store cursor). Only entries published after the cursor are considered;
+         feed entries carry their title/summary, sitemap entries need their article page.
+         Feeds are fetched conditionally, so an idle refresh is a 304 or a few KB of XML.
+      2. the HTML listing page, when no feed/sitemap is usable.
+
+    New articles are appended to `store` and the payload is the newest `max_items`
+    rows of the store. Without a store (standalone use) every refresh starts from scratch.
+
+    Output schema (same fields as the former Scrapy spider, plus date):
+      [{title, summary, link, date}, ...]  newest first
+    """
+    start = time.time()
+
+    async with scraper_client(client, timeout_sec, user_agent) as client:
+        sem = asyncio.Semaphore(concurrency)
+
+        async def with_article(entry: Dict[str, Any]) -> Dict[str, Any] | None:
+            # Always a new dict: feed entries are owned by the fetcher's cache (reused on 304)
+            if entry.get("title") and entry.get("summary"):
+                return {**entry}
+            async with sem:
+                try:
+                    article = await fetcher.fetch(client, entry["link"], _parse_news_article)
+                except Exception as e:
+                    logger.warning("News: cannot fetch article %s: %s", entry["link"], e)
+                    return None
+            return {**entry, **{k: v for k, v in article.items() if v and not entry.get(k)}}
+
+        cursor = await asyncio.to_thread(store.get_cursor) if store is not None else None
+        entries: List[Dict[str, Any]] | None = None
+        if cursor is None:
+            found = await _discover(client, news_url, feed_candidates(news_url, feed_urls or []))
+            if found is not None:
+                cursor, entries = found
+
+        new_items: List[Dict[str, Any]] = []
+        source = news_url
+        if cursor is not None:
+            try:
+                if entries is None:
+                    _kind, entries = await _feed_entries(client, news_url, cursor.source_url, cursor.cursor)
+            except (httpx.HTTPError, ValueError) as e:
+                # Feed gone or broken: forget it, the next refresh rediscovers a source.
+                logger.warning("News: feed %s failed (%s); falling back to the listing page", cursor.source_url, e)
+                if store is not None:
+                    await asyncio.to_thread(store.clear_cursor)
+                cursor = None
+            else:
+                if store is not None:
+                    # Undated entries come back on every refresh: skip those already ingested.
+                    known = await asyncio.to_thread(store.known, [e["link"] for e in entries])
+                    entries = [e for e in entries if e["link"] not in known]
+                # Stable sort: undated entries keep their feed order, after the dated ones
+                entries = sorted(entries, key=lambda e: e["published_at"], reverse=True)[:max_items]
+                results = await asyncio.gather(*[with_article(e) for e in entries])
+                new_items = [item for item in results if item is not None]
+                source = cursor.source_url
+                # The cursor only follows feed dates (undated entries are tracked by link)
+                newest = max((e["published_at"] for e, item in zip(entries, results) if item is not None), default=0.0)
+                failed = [e["published_at"] for e, item in zip(entries, results) if item is None and e["published_at"]]
+                if failed:
+                    # Keep failed articles after the cursor so the next refresh retries them
+                    # (already stored ones are ignored by the append-only store).
+                    newest = min(newest, min(failed) - 1)
+                cursor = NewsCursor(cursor.source_url, cursor.kind, max(newest, cursor.cursor))
+                new_items = [
+                    {**item, "published_at": item["published_at"] or _timestamp(item.get("date")) or start - rank}
+                    for rank, item in enumerate(new_items)
+                ]
+
+        if cursor is None:
+            hrefs = await fetcher.fetch(client, news_url, _parse_news_listing)
+            urls = article_urls(news_url, hrefs, max_items)
+            if store is not None:
+                # Append-only store: articles already ingested are not fetched again.
+                known = await asyncio.to_thread(store.known, urls)
+                urls = [url for url in urls if url not in known]
+            results = await asyncio.gather(*[with_article({"link": url}) for url in urls])
+            new_items = [item for item in results if item is not None]
+            if urls and not new_items:
+                raise RuntimeError(f"No news article could be fetched from {news_url}")
+            # Listing order is newest first: keep it when pages carry no usable date.
+            new_items = [
+                {**item, "published_at": _timestamp(item.get("date")) or start - rank}
+                for rank, item in enumerate(new_items)
+            ]
+
+    if store is None:
+        out = [{k: item.get(k) for k in ("title", "summary", "link", "date")} for item in new_items]
+    else:
+        await asyncio.to_thread(store.append, new_items, source)
+        if cursor is not None:
+            await asyncio.to_thread(store.set_cursor, cursor)
+        out = await asyncio.to_thread(store.latest, max_items)
+
+    duration_ms = int((time.time() - start) * 1000)
+    return out, duration_ms
@@ -2,25 +2,15 @@ from __future__ import annotations
 
 import re
 import time
-from html import unescape
 from typing import Any, Dict, Tuple
 
 import httpx
 
-
-PEDAGOGY_URL = "https://www.epitech.eu/ecole-informatique-apres-bac/pedagogie/"
+from app.services.html_extract import extract_page
+from app.services.http_fetch import fetcher, scraper_client
 
 
-def _strip_tags(html: str) -> str:
-    # Remove script/style blocks first
-    html = re.sub(r"(?is)<(script|style)[^>]*>.*?</\1>", " ", html)
-    # Strip all tags
-    text = re.sub(r"(?s)<[^>]+>", " ", html)
-    text = unescape(text)
-    # Normalize whitespace
-    text = re.sub(r"[ \t\r\f\v]+", " ", text)
-    text = re.sub(r"\n\s*\n+", "\n", text)
-    return text.strip()
+PEDAGOGY_URL = "https://www.epitech.eu/ecole-informatique-apres-bac/pedagogie/"
 
 
 def _extract_after(label: str, text: str, max_len: int = 280) -> str | None:
@@ -60,19 +50,8 @@ def _extract_pillars(text: str) -> list[str]:
     return out[:8]
 
 
-async def scrape_pedagogy(timeout_sec: int, user_agent: str) -> Tuple[Dict[str, Any], int]:
-    """
-    Returns (pedagogy_data, duration_ms)
-    """
-    headers = {"User-Agent": user_agent}
-    start = time.time()
-    async with httpx.AsyncClient(timeout=timeout_sec, headers=headers, follow_redirects=True) as client:
-        r = await client.get(PEDAGOGY_URL)
-        r.raise_for_status()
-        html = r.text or ""
-    duration_ms = int((time.time() - start) * 1000)
-
-    text = _strip_tags(html)
+def _parse_pedagogy(html: str) -> Dict[str, Any]:
+    text = extract_page(html).text_with_newlines()
 
     data: Dict[str, Any] = {
         "url": PEDAGOGY_URL,
@@ -92,5 +71,18 @@ async def scrape_pedagogy(timeout_sec: int, user_agent: str) -> Tuple[Dict[str,
     if s:
         data["summary"] = s
 
-    return data, duration_ms
+    return data
+
 
+async def scrape_pedagogy(
+    timeout_sec: int, user_agent: str, client: httpx.AsyncClient | None = None
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Returns (pedagogy_data, duration_ms)
+    """
+    start = time.time()
+    async with scraper_client(client, timeout_sec, user_agent) as client:
+        data = await fetcher.fetch(client, PEDAGOGY_URL, _parse_pedagogy)
+    duration_ms = int((time.time() - start) * 1000)
+
+    return data, duration_ms
@@ -2,21 +2,15 @@ from __future__ import annotations
 
 import re
 import time
-from html import unescape
 from typing import Any, Dict, Tuple
 
 import httpx
 
-
-VALUES_URL = "https://www.epitech.eu/ecole-informatique-apres-bac/engagements/"
+from app.services.html_extract import extract_page
+from app.services.http_fetch import fetcher, scraper_client
 
 
-def _strip_tags(html: str) -> str:
-    html = re.sub(r"(?is)<(script|style)[^>]*>.*?</\1>", " ", html)
-    text = re.sub(r"(?s)<[^>]+>", " ", html)
-    text = unescape(text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+VALUES_URL = "https://www.epitech.eu/ecole-informatique-apres-bac/engagements/"
 
 
 def _extract_values_sentence(text: str) -> str | None:
@@ -49,22 +43,23 @@ def _extract_values_sentence(text: str) -> str | None:
     return None
 
 
-async def scrape_values(timeout_sec: int, user_agent: str) -> Tuple[Dict[str, Any], int]:
-    headers = {"User-Agent": user_agent}
-    start = time.time()
-    async with httpx.AsyncClient(timeout=timeout_sec, headers=headers, follow_redirects=True) as client:
-        r = await client.get(VALUES_URL)
-        r.raise_for_status()
-        html = r.text or ""
-    duration_ms = int((time.time() - start) * 1000)
-
-    text = _strip_tags(html)
+def _parse_values(html: str) -> Dict[str, Any]:
+    text = extract_page(html).text()
     values_sentence = _extract_values_sentence(text)
 
-    data: Dict[str, Any] = {
+    return {
         "url": VALUES_URL,
         "values_sentence": values_sentence,
         "values": ["excellence", "courage", "solidarité"] if values_sentence else [],
     }
-    return data, duration_ms
 
+
+async def scrape_values(
+    timeout_sec: int, user_agent: str, client: httpx.AsyncClient | None = None
+) -> Tuple[Dict[str, Any], int]:
+    start = time.time()
+    async with scraper_client(client, timeout_sec, user_agent) as client:
+        data = await fetcher.fetch(client, VALUES_URL, _parse_values)
+    duration_ms = int((time.time() - start) * 1000)
+
+    return data, duration_ms
@@ -0,0 +1,123 @@
+"""Shared HTML extraction for the scrapers.
+
+`extract_page` processes a page once and returns everything the scrapers
+need: <title>, first <h1>, <meta name=...> / <meta property=...> contents and
+the visible text (script/style bodies and comments dropped). Text is kept as a
+stream with tag markers so each scraper can render it the way its heuristics
+expect (flat text, text with source newlines, or block-separated lines)
+without going back to the HTML.
+
+Implementation note: the text stream is produced by three C-level `re.sub`
+passes. A Python-level tokenizer (`html.parser.HTMLParser`, or one regex walked
+token by token) allocates objects per tag and was measured slower than the old
+per-field regexes on our pages; see benchmarks/bench_html_extract.py.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html import unescape
+from typing import Dict, List
+
+
+_SKIP_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_BLOCK_RE = re.compile(r"<br\b[^>]*>|</(?:p|div|li|h[1-4]|section|article)\s*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_TITLE_RE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+_H1_RE = re.compile(r"<h1\b[^>]*>(.*?)</h1\s*>", re.IGNORECASE | re.DOTALL)
+_META_RE = re.compile(r"<meta\b([^>]*)>", re.IGNORECASE)
+_ANCHOR_RE = re.compile(r"<a\b([^>]*)>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_INLINE_WS_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+# Markers in the text stream: a tag boundary, and a block boundary (line break in `lines()`).
+_TAG = "\x00"
+_BLOCK = "\x01"
+
+
+def _collapse(s: str) -> str:
+    # Same result as re.sub(r"\s+", " ", s).strip(), ~3x cheaper on long text.
+    return " ".join(s.split())
+
+
+@dataclass
+class PageExtract:
+    title: str | None = None
+    h1: str | None = None
+    # <meta name=...> (lower-cased names) and <meta property=...> (og:*), first occurrence wins
+    meta: Dict[str, str] = field(default_factory=dict)
+    og: Dict[str, str] = field(default_factory=dict)
+    stream: str = ""
+
+    def text(self) -> str:
+        """Visible text, every whitespace run collapsed to one space."""
+        return _collapse(self.stream.replace(_TAG, " ").replace(_BLOCK, " "))
+
+    def text_with_newlines(self) -> str:
+        """Visible text keeping the page's own line breaks (blank lines collapsed)."""
+        s = self.stream.replace(_TAG, " ").replace(_BLOCK, " ")
+        s = _INLINE_WS_RE.sub(" ", s)
+        s = _BLANK_LINES_RE.sub("\n", s)
+        return s.strip()
+
+    def lines(self) -> List[str]:
+        """Non-empty text lines, broken at <br>, script/style and the end of block elements."""
+        s = self.stream.replace(_TAG, "").replace(_BLOCK, "\n").replace("\r", "\n")
+        out = []
+        for ln in s.split("\n"):
+            ln = ln.strip(" \t\u00a0")
+            if ln:
+                out.append(ln)
+        return out
+
+
+def _attrs(raw: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for m in _ATTR_RE.finditer(raw):
+        name = m.group(1).lower()
+        if name not in out:
+            val = next(v for v in m.group(2, 3, 4) if v is not None)
+            out[name] = unescape(val)
+    return out
+
+
+def _inner_text(fragment: str) -> str:
+    return _collapse(unescape(_TAG_RE.sub(" ", fragment)))
+
+
+def extract_page(html: str) -> PageExtract:
+    page = PageExtract()
+    body = _SKIP_RE.sub(_BLOCK, html or "")
+
+    for m in _META_RE.finditer(body):
+        attrs = _attrs(m.group(1))
+        content = (attrs.get("content") or "").strip()
+        if not content:
+            continue
+        if "name" in attrs:
+            page.meta.setdefault(attrs["name"].lower(), content)
+        if "property" in attrs:
+            page.og.setdefault(attrs["property"].lower(), content)
+
+    m = _TITLE_RE.search(body)
+    if m:
+        page.title = _inner_text(m.group(1))
+    m = _H1_RE.search(body)
+    if m:
+        page.h1 = _inner_text(m.group(1))
+
+    page.stream = unescape(_TAG_RE.sub(_TAG, _BLOCK_RE.sub(_BLOCK, body)))
+    return page
+
+
+def extract_links(html: str) -> List[str]:
+    """href of every <a> (unescaped, as written in the page), first occurrence order, duplicates dropped."""
+    body = _SKIP_RE.sub(" ", html or "")
+    seen: Dict[str, None] = {}
+    for m in _ANCHOR_RE.finditer(body):
+        href = (_attrs(m.group(1)).get("href") or "").strip()
+        if href:
+            seen.setdefault(href, None)
+    return list(seen)
@@ -0,0 +1,155 @@
+"""Conditional page fetching shared by the scrapers.
+
+Validators (ETag / Last-Modified) are remembered per URL and sent back as
+If-None-Match / If-Modified-Since. On 304, or when the body hash is unchanged
+(servers without validators), the previous extraction is reused and the HTML is
+not parsed again.
+
+Parsing is CPU-bound regex work: when a process pool is attached, pages larger
+than `inline_max_bytes` are parsed there so the event loop keeps serving other
+requests while a crawl is being processed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+
+import httpx
+
+from app.core.settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Pooled keep-alive client shared by every scraper (created once in the app lifespan)."""
+    http2 = settings.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("MCP_HTTP2 is enabled but the 'h2' package is missing; falling back to HTTP/1.1")
+        http2 = False
+    return httpx.AsyncClient(
+        timeout=settings.scrape_timeout_sec,
+        headers={"User-Agent": settings.user_agent},
+        follow_redirects=True,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_sec,
+        ),
+    )
+
+
+def create_parse_pool(settings: Settings) -> ProcessPoolExecutor | None:
+    """Process pool for HTML extraction (created once in the app lifespan), None when disabled."""
+    if settings.parse_workers <= 0:
+        return None
+    # spawn: forking a process that already runs the event loop and worker threads is unsafe.
+    return ProcessPoolExecutor(max_workers=settings.parse_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+@asynccontextmanager
+async def scraper_client(
+    client: httpx.AsyncClient | None, timeout_sec: int, user_agent: str
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the shared client when given, else a short-lived one (standalone scraper use)."""
+    if client is not None:
+        yield client
+        return
+    headers = {"User-Agent": user_agent}
+    async with httpx.AsyncClient(timeout=timeout_sec, headers=headers, follow_redirects=True) as own:
+        yield own
+
+
+@dataclass
+class _Validators:
+    etag: str | None
+    last_modified: str | None
+    body_hash: str
+    result: Any
+
+
+class ConditionalFetcher:
+    def __init__(self) -> None:
+        # (url, extractor) -> validators + last extraction
+        self._entries: Dict[Tuple[str, str], _Validators] = {}
+        self.stats: Dict[str, int] = {
+            "modified": 0,
+            "not_modified": 0,
+            "same_body": 0,
+            "parsed_off_loop": 0,
+            "bytes_received": 0,
+        }
+        # Attached by the app lifespan; extractors must be module-level functions (picklable).
+        self.executor: Executor | None = None
+        self.inline_max_bytes = 0
+
+    @staticmethod
+    def _key(url: str, extract: Callable[[Any], Any]) -> Tuple[str, str]:
+        return url, f"{extract.__module__}.{extract.__qualname__}"
+
+    async def fetch(self, client: httpx.AsyncClient, url: str, extract: Callable[[Any], Any], raw: bool = False) -> Any:
+        """
+        GET `url` and return `extract(html)`; with `raw`, `extract` gets the body bytes
+        instead (XML, whose parser must honor the document's declared encoding).
+        Raises httpx errors like a plain `client.get(...).raise_for_status()` would.
+        """
+        key = self._key(url, extract)
+        prev = self._entries.get(key)
+
+        headers: Dict[str, str] = {}
+        if prev is not None:
+            if prev.etag:
+                headers["If-None-Match"] = prev.etag
+            if prev.last_modified:
+                headers["If-Modified-Since"] = prev.last_modified
+
+        r = await client.get(url, headers=headers)
+        self.stats["bytes_received"] += len(r.content)
+        if r.status_code == 304 and prev is not None:
+            self.stats["not_modified"] += 1
+            return prev.result
+        r.raise_for_status()
+
+        body = r.content if raw else (r.text or "")
+        body_hash = hashlib.sha256(r.content).hexdigest()
+        if prev is not None and prev.body_hash == body_hash:
+            self.stats["same_body"] += 1
+            result = prev.result
+        else:
+            self.stats["modified"] += 1
+            result = await self._extract(extract, body, len(r.content))
+
+        self._entries[key] = _Validators(
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            body_hash=body_hash,
+            result=result,
+        )
+        return result
+
+    async def _extract(self, extract: Callable[[Any], Any], body: str | bytes, size: int) -> Any:
+        if self.executor is None or size <= self.inline_max_bytes:
+            return extract(body)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, extract, body)
+        except BrokenProcessPool:
+            logger.warning("Parse pool is broken; parsing inline from now on")
+            self.executor = None
+            return extract(body)
+        self.stats["parsed_off_loop"] += 1
+        return result
+
+
+# Process-wide instance: validators survive across refreshes of every tool.
+fetcher = ConditionalFetcher()
@@ -0,0 +1,140 @@
+"""
+Micro-benchmark: per-page HTML extraction, legacy regex helpers vs `extract_page`.
+
+Run from the mcp/ folder:
+    python benchmarks/bench_html_extract.py [page.html ...]
+
+Without arguments a synthetic page shaped like the epitech.eu program pages
+(WordPress/Elementor markup, large inline script/style blocks) is used. The
+script also checks that both paths produce the same fields.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import timeit
+from html import unescape
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.epitech_degrees import _extract_duration_hints, _parse_degree_page  # noqa: E402
+from app.services.html_extract import extract_page  # noqa: E402
+
+
+# -------------------------
+# Legacy helpers (copied from the scrapers before the shared extractor)
+# -------------------------
+def _legacy_strip_tags(html: str) -> str:
+    html = re.sub(r"(?is)<(script|style)[^>]*>.*?</\1>", " ", html)
+    text = re.sub(r"(?s)<[^>]+>", " ", html)
+    text = unescape(text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _legacy_meta(html: str, attr: str, name: str) -> str | None:
+    m = re.search(
+        rf'(?is)<meta[^>]+{attr}=["\']{re.escape(name)}["\'][^>]+content=["\']([^"\']+)["\']',
+        html,
+    )
+    return unescape(m.group(1)).strip() if m else None
+
+
+def _legacy_title(html: str) -> str | None:
+    m = re.search(r"(?is)<title[^>]*>(.*?)</title>", html)
+    return unescape(re.sub(r"\s+", " ", m.group(1))).strip() if m else None
+
+
+def _legacy_h1(html: str) -> str | None:
+    m = re.search(r"(?is)<h1[^>]*>(.*?)</h1>", html)
+    return unescape(_legacy_strip_tags(m.group(1))) if m else None
+
+
+def _legacy_snippet(text: str, max_len: int = 320) -> str | None:
+    if not text:
+        return None
+    t = re.sub(r"\s+", " ", text).strip()
+    if len(t) <= max_len:
+        return t
+    cut = t[:max_len]
+    m = re.search(r"[.!?]\s", cut)
+    if m:
+        return cut[: m.end()].strip()
+    return cut.strip() + "…"
+
+
+def legacy_degree_page(html: str) -> Dict[str, Any]:
+    text = _legacy_strip_tags(html)
+    return {
+        "title": _legacy_meta(html, "property", "og:title") or _legacy_title(html),
+        "h1": _legacy_h1(html),
+        "description": _legacy_meta(html, "name", "description") or _legacy_meta(html, "property", "og:description"),
+        "snippet": _legacy_snippet(text, 360),
+        "duration_hints": _extract_duration_hints(text),
+    }
+
+
+def legacy_text_lines(raw_html: str) -> List[str]:
+    s = raw_html
+    s = re.sub(r"(?is)<script[^>]*>.*?</script>", "\n", s)
+    s = re.sub(r"(?is)<style[^>]*>.*?</style>", "\n", s)
+    s = re.sub(r"(?i)<br\s*/?>", "\n", s)
+    s = re.sub(r"(?i)</(p|div|li|h1|h2|h3|h4|section|article)>", "\n", s)
+    s = re.sub(r"(?is)<[^>]+>", "", s)
+    s = unescape(s)
+    s = s.replace("\r", "\n")
+    s = re.sub(r"[ \t]+\n", "\n", s)
+    s = re.sub(r"\n{3,}", "\n\n", s)
+    lines = [ln.strip(" \t\u00a0") for ln in s.split("\n")]
+    return [ln for ln in lines if ln]
+
+
+# -------------------------
+# Harness
+# -------------------------
+def synthetic_page(blocks: int = 400) -> str:
+    parts = [
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">',
+        "<title>Programme Bachelor | Epitech</title>",
+        '<meta name="description" content="Le Bachelor Epitech en 3 ans &amp; plus">',
+        '<meta property="og:title" content="Bachelor Epitech">',
+        '<meta property="og:description" content="Description og">',
+    ]
+    parts += [f'<link rel="stylesheet" href="/wp-content/x{i}.css?ver=1.2.3" media="all">' for i in range(30)]
+    parts.append('<script type="application/ld+json">' + '{"a":"b"}' * 800 + "</script>")
+    parts.append("<style>" + ".c{color:red}" * 1500 + '</style></head><body class="page">')
+    for i in range(blocks):
+        parts.append(
+            f'<div class="elementor-widget-wrap"><section class="s{i}"><h2 class="t">Titre {i}</h2>'
+            f'<p>Le programme dure 3 ans et propose des projets <a href="/x/{i}">innovants</a> '
+            "&eacute;l&egrave;ves, 6 mois de stage.</p><ul><li>item</li><li>item <b>b</b></li></ul></section></div>"
+        )
+        if i == 5:
+            parts.append('<h1 class="hero">Programme <span>Bachelor</span></h1>')
+    parts.append("<script>" + "var x=1;" * 3000 + "</script></body></html>")
+    return "".join(parts)
+
+
+def _ms(fn: Callable[[], Any], number: int = 20) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def bench(name: str, html: str) -> None:
+    same_fields = legacy_degree_page(html) == _parse_degree_page(html)
+    same_lines = legacy_text_lines(html) == extract_page(html).lines()
+    print(f"{name}: {len(html) // 1024} KB, same degree fields={same_fields}, same contact lines={same_lines}")
+    print(f"  degree page   legacy {_ms(lambda: legacy_degree_page(html)):7.2f} ms   "
+          f"extract_page {_ms(lambda: _parse_degree_page(html)):7.2f} ms")
+    print(f"  contact lines legacy {_ms(lambda: legacy_text_lines(html)):7.2f} ms   "
+          f"extract_page {_ms(lambda: extract_page(html).lines()):7.2f} ms")
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:]
+    if not paths:
+        bench("synthetic", synthetic_page())
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            bench(os.path.basename(path), f.read())